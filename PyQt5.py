@@ -1,9 +1,29 @@
-import sys, json, csv, re
-from typing import Dict, Any, List
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox,QLabel, QLineEdit, QPushButton, QComboBox, QTabWidget, QTableWidget, QTableWidgetItem,QMessageBox, QFileDialog, QAction, QToolBar)
-from PyQt5.QtCore import Qt
+import sys, json, csv, re, functools
+from dataclasses import dataclass, field, InitVar
+from typing import Dict, Any, List, Optional, Tuple
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox,QLabel, QLineEdit, QPushButton, QComboBox, QTabWidget, QTableView,QMessageBox, QFileDialog, QAction, QToolBar)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtGui import QStandardItemModel, QStandardItem
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # optional: tables fall back to plain Python filtering
+    pa = pc = None
+try:
+    import orjson  # optional: faster JSON save/load
+except ImportError:
+    orjson = None
+try:
+    import ijson  # optional: stream large snapshots instead of loading them whole
+except ImportError:
+    ijson = None
+try:
+    import re2 as _re_impl  # optional: linear-time matching, no backtracking
+except ImportError:
+    _re_impl = re
 
-EMAIL_REGEX = re.compile(r"^[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}$")
+EMAIL_PATTERN = r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}"
+EMAIL_REGEX = _re_impl.compile(EMAIL_PATTERN)
 
 def validate_nonempty_str(value: str, field: str):
     if not isinstance(value, str) or not value.strip():
@@ -13,22 +33,42 @@ def validate_nonneg_int(value: int, field: str):
     if not isinstance(value, int) or value < 0:
         raise ValueError(f"{field} must be a non-negative integer")
 
+@functools.lru_cache(maxsize=4096)
+def _email_ok(email: str) -> bool:
+    # Memoized: the same addresses are revalidated on every edit and load
+    return EMAIL_REGEX.fullmatch(email) is not None
+
 def validate_email(email: str):
-    if not isinstance(email, str) or not EMAIL_REGEX.match(email):
+    if not isinstance(email, str) or not _email_ok(email):
         raise ValueError(f"Invalid email: {email}")
 
+# Ages are small ints; their display strings are built once instead of per cell
+_AGE_STR = tuple(str(i) for i in range(200))
+
+def _age_str(age: int) -> str:
+    return _AGE_STR[age] if age < 200 else str(age)
+
+def _rekey(d: Dict[str, Any], old: str, new: str):
+    # Rename a key in place while keeping the insertion order of the dict
+    items = [((new if k == old else k), v) for k, v in d.items()]
+    d.clear(); d.update(items)
+
+@dataclass(slots=True, eq=False)
 class Person:
     """
     Represents a person with basic info.
     Used as a base for Student and Instructor.
     """
-    def __init__(self, name: str, age: int, email: str):
-        # Initialize a person with name, age, and email
-        validate_nonempty_str(name, "name")
-        validate_nonneg_int(age, "age")
+    name: str
+    age: int
+    # Passed to __init__ as email=, as before the dataclass conversion; stored as _email
+    email: InitVar[str]
+    _email: str = field(init=False)
+    def __post_init__(self, email: str):
+        # Validate name, age, and email
+        validate_nonempty_str(self.name, "name")
+        validate_nonneg_int(self.age, "age")
         validate_email(email)
-        self.name = name
-        self.age = age
         self._email = email
     def introduce(self):
         """Prints a simple introduction for the person."""
@@ -39,26 +79,45 @@ class Person:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Person":
         """Creates a Person object from a dictionary."""
-        return cls(name=data["name"], age=data["age"], email=data["email"])
+        return cls(data["name"], data["age"], data["email"])
 
+@dataclass(slots=True, eq=False)
 class Student(Person):
     """
     Student class, inherits from Person.
     Adds student_id and registered courses.
     """
-    def __init__(self, name: str, age: int, email: str, student_id: str):
-        # Initialize a student with ID and empty course list
-        super().__init__(name, age, email)
-        validate_nonempty_str(student_id, "student_id")
-        self.student_id = student_id
-        self.registered_courses: List["Course"] = []
+    student_id: str
+    registered_courses: Dict[str, "Course"] = field(default_factory=dict, repr=False)
+    _courses_cache: Optional[str] = field(default=None, init=False, repr=False)
+    _search_blob: Optional[str] = field(default=None, init=False, repr=False)
+    def __post_init__(self, email: str):
+        # slots=True rebuilds the class, so zero-argument super() cannot be used here
+        Person.__post_init__(self, email)
+        validate_nonempty_str(self.student_id, "student_id")
+    @property
+    def courses_str(self) -> str:
+        """Comma-joined ids of the registered courses, cached until they change."""
+        if self._courses_cache is None:
+            self._courses_cache = ", ".join([c.course_id for c in self.registered_courses.values()])
+        return self._courses_cache
+    @property
+    def search_blob(self) -> str:
+        """Lowercased id, name and courses joined into one string for the search box."""
+        if self._search_blob is None:
+            self._search_blob = f"{self.student_id.lower()}\0{self.name.lower()}\0{self.courses_str.lower()}"
+        return self._search_blob
+    def invalidate_cache(self):
+        """Drop cached display strings after the name, id or course list changed."""
+        self._courses_cache = None; self._search_blob = None
     def register_course(self, course: "Course"):
         """Register the student to a course."""
         if not isinstance(course, Course):
             raise TypeError("course must be a Course object")
-        if course not in self.registered_courses:
-            self.registered_courses.append(course)
-            if self not in course.enrolled_students:
+        if course.course_id not in self.registered_courses:
+            self.registered_courses[course.course_id] = course
+            self.invalidate_cache()
+            if self.student_id not in course.enrolled_students:
                 course._enroll_without_backlink(self)
     def to_dict(self) -> Dict[str, Any]:
         """Returns a dictionary representation of the student."""
@@ -68,30 +127,48 @@ class Student(Person):
             "age": self.age,
             "email": self._email,
             "student_id": self.student_id,
-            "registered_course_ids": [c.course_id for c in self.registered_courses]
+            "registered_course_ids": [c.course_id for c in self.registered_courses.values()]
         }
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Student":
         """Creates a Student object from a dictionary."""
         return cls(data["name"], data["age"], data["email"], data["student_id"])
 
+@dataclass(slots=True, eq=False)
 class Instructor(Person):
     """
     Instructor class, inherits from Person.
     Adds instructor_id and assigned courses.
     """
-    def __init__(self, name: str, age: int, email: str, instructor_id: str):
-        # Initialize an instructor with ID and empty course list
-        super().__init__(name, age, email)
-        validate_nonempty_str(instructor_id, "instructor_id")
-        self.instructor_id = instructor_id
-        self.assigned_courses: List["Course"] = []
+    instructor_id: str
+    assigned_courses: Dict[str, "Course"] = field(default_factory=dict, repr=False)
+    _courses_cache: Optional[str] = field(default=None, init=False, repr=False)
+    _search_blob: Optional[str] = field(default=None, init=False, repr=False)
+    def __post_init__(self, email: str):
+        Person.__post_init__(self, email)
+        validate_nonempty_str(self.instructor_id, "instructor_id")
+    @property
+    def courses_str(self) -> str:
+        """Comma-joined ids of the assigned courses, cached until they change."""
+        if self._courses_cache is None:
+            self._courses_cache = ", ".join([c.course_id for c in self.assigned_courses.values()])
+        return self._courses_cache
+    @property
+    def search_blob(self) -> str:
+        """Lowercased id, name and courses joined into one string for the search box."""
+        if self._search_blob is None:
+            self._search_blob = f"{self.instructor_id.lower()}\0{self.name.lower()}\0{self.courses_str.lower()}"
+        return self._search_blob
+    def invalidate_cache(self):
+        """Drop cached display strings after the name, id or course list changed."""
+        self._courses_cache = None; self._search_blob = None
     def assign_course(self, course: "Course"):
         """Assign the instructor to a course."""
         if not isinstance(course, Course):
             raise TypeError("course must be a Course object")
-        if course not in self.assigned_courses:
-            self.assigned_courses.append(course)
+        if course.course_id not in self.assigned_courses:
+            self.assigned_courses[course.course_id] = course
+            self.invalidate_cache()
     def to_dict(self) -> Dict[str, Any]:
         """Returns a dictionary representation of the instructor."""
         return {
@@ -100,53 +177,74 @@ class Instructor(Person):
             "age": self.age,
             "email": self._email,
             "instructor_id": self.instructor_id,
-            "assigned_course_ids": [c.course_id for c in self.assigned_courses]
+            "assigned_course_ids": [c.course_id for c in self.assigned_courses.values()]
         }
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Instructor":
         """Creates an Instructor object from a dictionary."""
         return cls(data["name"], data["age"], data["email"], data["instructor_id"])
 
+@dataclass(slots=True, eq=False)
 class Course:
     """
     Course class holds course info, instructor, and enrolled students.
     """
-    def __init__(self, course_id: str, course_name: str, instructor: Instructor):
-        # Initialize a course with ID, name, instructor, and empty student list
-        validate_nonempty_str(course_id, "course_id")
-        validate_nonempty_str(course_name, "course_name")
-        if not isinstance(instructor, Instructor):
+    course_id: str
+    course_name: str
+    instructor: Instructor = field(repr=False)
+    enrolled_students: Dict[str, Student] = field(default_factory=dict, repr=False)
+    _students_cache: Optional[str] = field(default=None, init=False, repr=False)
+    _search_blob: Optional[str] = field(default=None, init=False, repr=False)
+    def __post_init__(self):
+        # Validate ID, name, and instructor
+        validate_nonempty_str(self.course_id, "course_id")
+        validate_nonempty_str(self.course_name, "course_name")
+        if not isinstance(self.instructor, Instructor):
             raise TypeError("instructor must be an Instructor object")
-        self.course_id = course_id
-        self.course_name = course_name
-        self.instructor = instructor
-        self.enrolled_students: List[Student] = []
+    @property
+    def students_str(self) -> str:
+        """Comma-joined ids of the enrolled students, cached until they change."""
+        if self._students_cache is None:
+            self._students_cache = ", ".join([s.student_id for s in self.enrolled_students.values()])
+        return self._students_cache
+    @property
+    def search_blob(self) -> str:
+        """Lowercased id, name and students joined into one string for the search box."""
+        if self._search_blob is None:
+            self._search_blob = f"{self.course_id.lower()}\0{self.course_name.lower()}\0{self.students_str.lower()}"
+        return self._search_blob
+    def invalidate_cache(self):
+        """Drop cached display strings after the name, id or student list changed."""
+        self._students_cache = None; self._search_blob = None
     def add_student(self, student: "Student"):
         """Add a student to the course."""
         if not isinstance(student, Student):
             raise TypeError("student must be a Student object")
-        if student not in self.enrolled_students:
-            self.enrolled_students.append(student)
-            if self not in student.registered_courses:
+        if student.student_id not in self.enrolled_students:
+            self.enrolled_students[student.student_id] = student
+            self.invalidate_cache()
+            if self.course_id not in student.registered_courses:
                 student.register_course(self)
     def _enroll_without_backlink(self, student: "Student"):
         # Internal: enroll student without updating their course list
-        if student not in self.enrolled_students:
-            self.enrolled_students.append(student)
+        if student.student_id not in self.enrolled_students:
+            self.enrolled_students[student.student_id] = student
+            self.invalidate_cache()
     def set_instructor(self, instructor: "Instructor"):
         """Set or change the instructor for the course."""
         if not isinstance(instructor, Instructor):
             raise TypeError("instructor must be an Instructor object")
         if self.instructor is instructor:
-            if self not in instructor.assigned_courses:
-                instructor.assigned_courses.append(self)
+            if self.course_id not in instructor.assigned_courses:
+                instructor.assigned_courses[self.course_id] = self
+                instructor.invalidate_cache()
             return
         old = self.instructor
         self.instructor = instructor
-        if old and self in old.assigned_courses:
-            old.assigned_courses.remove(self)
-        if self not in instructor.assigned_courses:
-            instructor.assigned_courses.append(self)
+        if old is not None and old.assigned_courses.pop(self.course_id, None) is not None:
+            old.invalidate_cache()
+        instructor.assigned_courses[self.course_id] = self
+        instructor.invalidate_cache()
     def to_dict(self) -> Dict[str, Any]:
         """Returns a dictionary representation of the course."""
         return {
@@ -154,7 +252,7 @@ class Course:
             "course_id": self.course_id,
             "course_name": self.course_name,
             "instructor_id": self.instructor.instructor_id,
-            "enrolled_student_ids": [s.student_id for s in self.enrolled_students]
+            "enrolled_student_ids": [s.student_id for s in self.enrolled_students.values()]
         }
     @classmethod
     def from_dict(cls, data: Dict[str, Any], instructor_lookup: Dict[str, Instructor]) -> "Course":
@@ -170,33 +268,55 @@ class DataManager:
         self.students: Dict[str, Student] = {}
         self.instructors: Dict[str, Instructor] = {}
         self.courses: Dict[str, Course] = {}
+        # Reverse index: email -> ("student" | "instructor", id)
+        self._email_owners: Dict[str, Tuple[str, str]] = {}
+        # Bumped by add_* and mark_dirty; callers that cache derived data key it on this
+        self._version = 0
+    @property
+    def version(self) -> int:
+        """Change counter; model-level edits only count once mark_dirty() is called."""
+        return self._version
+    def mark_dirty(self):
+        """Record that some entity changed (e.g. edited through the model API)."""
+        self._version += 1
     def email_in_use(self, email: str, exclude_kind: str = None, exclude_id: str = None) -> bool:
         """Check if an email is already used by a student or instructor."""
-        for s in self.students.values():
-            if s._email == email and not (exclude_kind == "student" and s.student_id == exclude_id):
-                return True
-        for i in self.instructors.values():
-            if i._email == email and not (exclude_kind == "instructor" and i.instructor_id == exclude_id):
-                return True
-        return False
+        owner = self._email_owners.get(email)
+        return owner is not None and owner != (exclude_kind, exclude_id)
+    def update_email_owner(self, old_email: str, new_email: str, kind: str, owner_id: str):
+        """Re-point the email index after a person's email or id changed."""
+        self._email_owners.pop(old_email, None)
+        self._email_owners[new_email] = (kind, owner_id)
+    def release_email(self, email: str):
+        """Drop an email from the index once its owner is deleted."""
+        self._email_owners.pop(email, None)
+    def _reindex_emails(self):
+        # Rebuild the email index from scratch (used after bulk loads)
+        self._email_owners = {s._email: ("student", sid) for sid, s in self.students.items()}
+        self._email_owners.update({i._email: ("instructor", iid) for iid, i in self.instructors.items()})
     def add_student(self, student: Student):
         """Add a new student to the system."""
         if not isinstance(student, Student): raise TypeError("student must be a Student object")
         if student.student_id in self.students: raise ValueError(f"Duplicate student_id: {student.student_id}")
         if self.email_in_use(student._email): raise ValueError(f"Email already in use: {student._email}")
         self.students[student.student_id] = student
+        self._email_owners[student._email] = ("student", student.student_id)
+        self.mark_dirty()
     def add_instructor(self, instructor: Instructor):
         """Add a new instructor to the system."""
         if not isinstance(instructor, Instructor): raise TypeError("instructor must be an Instructor object")
         if instructor.instructor_id in self.instructors: raise ValueError(f"Duplicate instructor_id: {instructor.instructor_id}")
         if self.email_in_use(instructor._email): raise ValueError(f"Email already in use: {instructor._email}")
         self.instructors[instructor.instructor_id] = instructor
+        self._email_owners[instructor._email] = ("instructor", instructor.instructor_id)
+        self.mark_dirty()
     def add_course(self, course: Course):
         """Add a new course to the system."""
         if not isinstance(course, Course): raise TypeError("course must be a Course object")
         if course.course_id in self.courses: raise ValueError(f"Duplicate course_id: {course.course_id}")
         self.courses[course.course_id] = course
         course.set_instructor(course.instructor)
+        self.mark_dirty()
     def to_dict(self):
         """Returns a dictionary of all data for saving."""
         return {
@@ -204,36 +324,191 @@ class DataManager:
             "instructors": [i.to_dict() for i in self.instructors.values()],
             "courses": [c.to_dict() for c in self.courses.values()]
         }
-    def save_json(self, path: str):
-        """Save all data to a JSON file."""
+    def save_json(self, path: str, data: Optional[Dict[str, Any]] = None):
+        """Save all data (or a to_dict() result the caller already has) to a JSON file."""
+        if data is None:
+            data = self.to_dict()
+        if orjson is not None:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            return
         with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, indent=2)
+            json.dump(data, f, indent=2)
+    @staticmethod
+    def _json_sections(path: str):
+        # Return a function yielding the items of one top-level list of the file.
+        # With ijson each section is streamed, so only one item is in memory at a time.
+        if ijson is not None:
+            def section(key):
+                with open(path, "rb") as f:
+                    yield from ijson.items(f, f"{key}.item")
+            return section
+        if orjson is not None:
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        return lambda key: data.get(key, [])
     @classmethod
     def load_json(cls, path: str) -> "DataManager":
         """Load all data from a JSON file."""
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        section = cls._json_sections(path)
         dm = cls()
-        for i_data in data.get("instructors", []):
+        for i_data in section("instructors"):
             instr = Instructor.from_dict(i_data)
             dm.instructors[instr.instructor_id] = instr
-        for s_data in data.get("students", []):
+        for s_data in section("students"):
             stu = Student.from_dict(s_data)
             dm.students[stu.student_id] = stu
-        for c_data in data.get("courses", []):
+        for c_data in section("courses"):
             course = Course.from_dict(c_data, dm.instructors)
             dm.courses[course.course_id] = course
             course.set_instructor(course.instructor)
-        for c_data in data.get("courses", []):
-            course = dm.courses[c_data["course_id"]]
             for sid in c_data.get("enrolled_student_ids", []):
                 student = dm.students.get(sid)
-                if student and student not in course.enrolled_students:
-                    course.enrolled_students.append(student)
-                    if course not in student.registered_courses:
-                        student.registered_courses.append(course)
+                if student and sid not in course.enrolled_students:
+                    course.enrolled_students[sid] = student
+                    if course.course_id not in student.registered_courses:
+                        student.registered_courses[course.course_id] = course
+        dm._reindex_emails()
         return dm
 
+class ArrowBackend:
+    """
+    Columnar copy of the three tabs built with pyarrow.
+    Rows are stored as Arrow string columns and search is done with Arrow
+    string kernels, so refreshing and filtering never loop over rows in Python.
+    """
+    SEARCH_COLUMNS = ("id", "name", "courses")
+    def __init__(self):
+        self.tables: Dict[str, Any] = {}
+    def build(self, dm: DataManager, kinds=("students", "instructors", "courses")):
+        """Rebuild the Arrow tables of the given tabs from the current DataManager contents."""
+        for kind in kinds:
+            self.tables[kind] = getattr(self, f"_build_{kind}")(dm)
+    @staticmethod
+    def _build_students(dm: DataManager):
+        studs = list(dm.students.values())
+        return pa.table({
+            "id": pa.array([s.student_id for s in studs], pa.string()),
+            "name": pa.array([s.name for s in studs], pa.string()),
+            "age": pa.array([_age_str(s.age) for s in studs], pa.string()),
+            "email": pa.array([s._email for s in studs], pa.string()),
+            "courses": pa.array([s.courses_str for s in studs], pa.string()),
+        })
+    @staticmethod
+    def _build_instructors(dm: DataManager):
+        inss = list(dm.instructors.values())
+        return pa.table({
+            "id": pa.array([i.instructor_id for i in inss], pa.string()),
+            "name": pa.array([i.name for i in inss], pa.string()),
+            "age": pa.array([_age_str(i.age) for i in inss], pa.string()),
+            "email": pa.array([i._email for i in inss], pa.string()),
+            "courses": pa.array([i.courses_str for i in inss], pa.string()),
+        })
+    @staticmethod
+    def _build_courses(dm: DataManager):
+        crss = list(dm.courses.values())
+        return pa.table({
+            "id": pa.array([c.course_id for c in crss], pa.string()),
+            "name": pa.array([c.course_name for c in crss], pa.string()),
+            "instructor": pa.array([f"{c.instructor.instructor_id} - {c.instructor.name}" for c in crss], pa.string()),
+            "courses": pa.array([c.students_str for c in crss], pa.string()),
+            "instructor_id": pa.array([c.instructor.instructor_id for c in crss], pa.string()),
+        })
+    def filter(self, kind: str, q: str):
+        """Return the rows of one tab whose id, name or course list contains q (already lowercased)."""
+        t = self.tables[kind]
+        if not q: return t
+        mask = None
+        for col in self.SEARCH_COLUMNS:
+            m = pc.match_substring(pc.utf8_lower(t.column(col)), q)
+            mask = m if mask is None else pc.or_(mask, m)
+        return t.filter(mask)
+
+class _EntityModel(QAbstractTableModel):
+    """
+    Base table model for the three tabs.
+    Holds only the ids of the rows to show; cell values are read from the
+    DataManager when Qt asks for them, so only visible rows are formatted.
+    When an Arrow table is given instead, cells are read from its columns.
+    """
+    HEADERS: List[str] = []
+    def __init__(self, dm: DataManager):
+        super().__init__()
+        self.dm = dm
+        self._ids: List[str] = []
+        self._table = None
+    def reset(self, dm: DataManager, ids: List[str] = None, table=None):
+        """Swap in a new list of row ids (or an Arrow table) with a single model reset."""
+        self.beginResetModel()
+        self.dm = dm
+        self._ids = ids or []
+        self._table = table
+        self.endResetModel()
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid(): return 0
+        return self._table.num_rows if self._table is not None else len(self._ids)
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.UserRole:
+            return self._user_data(index.row(), index.column())
+        if role != Qt.DisplayRole:
+            return None
+        if self._table is not None:
+            return self._table.column(index.column())[index.row()].as_py()
+        return self._cell(self._ids[index.row()], index.column())
+    def _cell(self, key: str, col: int) -> str:
+        raise NotImplementedError
+    def _user_data(self, row: int, col: int):
+        # Id behind a cell, for columns that show another entity
+        return None
+
+class StudentsModel(_EntityModel):
+    """Rows of the Students tab."""
+    HEADERS = ["Student ID","Name","Age","Email","Courses"]
+    def _cell(self, key, col):
+        s = self.dm.students[key]
+        if col == 0: return key
+        if col == 1: return s.name
+        if col == 2: return _age_str(s.age)
+        if col == 3: return s._email
+        return s.courses_str
+
+class InstructorsModel(_EntityModel):
+    """Rows of the Instructors tab."""
+    HEADERS = ["Instructor ID","Name","Age","Email","Courses"]
+    def _cell(self, key, col):
+        ins = self.dm.instructors[key]
+        if col == 0: return key
+        if col == 1: return ins.name
+        if col == 2: return _age_str(ins.age)
+        if col == 3: return ins._email
+        return ins.courses_str
+
+class CoursesModel(_EntityModel):
+    """Rows of the Courses tab."""
+    HEADERS = ["Course ID","Course Name","Instructor","Students"]
+    def _cell(self, key, col):
+        c = self.dm.courses[key]
+        if col == 0: return key
+        if col == 1: return c.course_name
+        if col == 2: return f"{c.instructor.instructor_id} - {c.instructor.name}"
+        return c.students_str
+    def _user_data(self, row, col):
+        if col != 2: return None
+        if self._table is not None:
+            return self._table.column("instructor_id")[row].as_py()
+        return self.dm.courses[self._ids[row]].instructor.instructor_id
+
 class SchoolQt(QMainWindow):
     """
     Main window for the school management system GUI.
@@ -245,11 +520,24 @@ class SchoolQt(QMainWindow):
         self.setWindowTitle("School Management System")
         self.resize(1200, 750)
         self.dm = DataManager()
+        self.arrow = ArrowBackend() if pa is not None else None
         self.edit_mode = {"students": None, "instructors": None, "courses": None}
+        self._resize_pending = False
+        # Which tabs (and the dropdowns) need rebuilding on the next _refresh_all
+        self._dirty = dict.fromkeys(("students", "instructors", "courses", "dropdowns"), True)
+        # (DataManager, version, to_dict() result) of the last save; every GUI edit goes
+        # through _mark_dirty, so an unchanged version means the snapshot is current
+        self._save_snapshot = None
         self._build_ui()
         self._refresh_all()
     def _build_ui(self):
         # Build all UI sections
+        # Dropdown contents live in shared models so each list is built once per change;
+        # every item carries its entity id as Qt.UserRole data
+        self._instructor_list = QStandardItemModel(self)
+        self._student_list = QStandardItemModel(self)
+        self._course_list = QStandardItemModel(self)
+        self._dropdown_rows: Dict[int, List[Tuple[str, str]]] = {}
         self._build_menu_toolbar()
         central = QWidget()
         root = QVBoxLayout(central)
@@ -302,7 +590,7 @@ class SchoolQt(QMainWindow):
         # Course form UI
         g = QGroupBox("Add / Edit Course")
         grid = QGridLayout(g)
-        self.c_id = QLineEdit(); self.c_name = QLineEdit(); self.c_instructor = QComboBox()
+        self.c_id = QLineEdit(); self.c_name = QLineEdit(); self.c_instructor = QComboBox(); self.c_instructor.setModel(self._instructor_list)
         grid.addWidget(QLabel("Course ID"),0,0); grid.addWidget(self.c_id,0,1)
         grid.addWidget(QLabel("Name"),0,2); grid.addWidget(self.c_name,0,3)
         grid.addWidget(QLabel("Instructor"),1,0); grid.addWidget(self.c_instructor,1,1,1,3)
@@ -316,6 +604,7 @@ class SchoolQt(QMainWindow):
         reg_box = QGroupBox("Register Student to Course")
         rg = QGridLayout(reg_box)
         self.reg_student = QComboBox(); self.reg_course = QComboBox()
+        self.reg_student.setModel(self._student_list); self.reg_course.setModel(self._course_list)
         rg.addWidget(QLabel("Student"),0,0); rg.addWidget(self.reg_student,0,1)
         rg.addWidget(QLabel("Course"),0,2); rg.addWidget(self.reg_course,0,3)
         btn = QPushButton("Register"); btn.clicked.connect(self._register_student_to_course)
@@ -323,6 +612,7 @@ class SchoolQt(QMainWindow):
         asg_box = QGroupBox("Assign Instructor to Course")
         ag = QGridLayout(asg_box)
         self.asg_instructor = QComboBox(); self.asg_course = QComboBox()
+        self.asg_instructor.setModel(self._instructor_list); self.asg_course.setModel(self._course_list)
         ag.addWidget(QLabel("Instructor"),0,0); ag.addWidget(self.asg_instructor,0,1)
         ag.addWidget(QLabel("Course"),0,2); ag.addWidget(self.asg_course,0,3)
         btn2 = QPushButton("Assign"); btn2.clicked.connect(self._assign_instructor_to_course)
@@ -334,6 +624,10 @@ class SchoolQt(QMainWindow):
         layout = QHBoxLayout()
         layout.addWidget(QLabel("Search (Name / ID / Course):"))
         self.search_edit = QLineEdit()
+        # Restart a short timer on each keystroke so only the final pause refreshes the tables
+        self._search_timer = QTimer(self); self._search_timer.setSingleShot(True); self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._apply_search)
+        self.search_edit.textChanged.connect(lambda _: self._search_timer.start())
         go = QPushButton("Search"); go.clicked.connect(self._apply_search)
         clr = QPushButton("Clear"); clr.clicked.connect(self._clear_search)
         layout.addWidget(self.search_edit); layout.addWidget(go); layout.addWidget(clr); layout.addStretch(1)
@@ -341,15 +635,15 @@ class SchoolQt(QMainWindow):
     def _tables_section(self):
         # Tables for displaying students, instructors, and courses
         self.tabs = QTabWidget()
-        self.stu_table = QTableWidget(0,5)
-        self.stu_table.setHorizontalHeaderLabels(["Student ID","Name","Age","Email","Courses"])
-        self.stu_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.ins_table = QTableWidget(0,5)
-        self.ins_table.setHorizontalHeaderLabels(["Instructor ID","Name","Age","Email","Courses"])
-        self.ins_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.crs_table = QTableWidget(0,4)
-        self.crs_table.setHorizontalHeaderLabels(["Course ID","Course Name","Instructor","Students"])
-        self.crs_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.stu_model = StudentsModel(self.dm)
+        self.stu_table = QTableView(); self.stu_table.setModel(self.stu_model)
+        self.stu_table.setSelectionBehavior(QTableView.SelectRows)
+        self.ins_model = InstructorsModel(self.dm)
+        self.ins_table = QTableView(); self.ins_table.setModel(self.ins_model)
+        self.ins_table.setSelectionBehavior(QTableView.SelectRows)
+        self.crs_model = CoursesModel(self.dm)
+        self.crs_table = QTableView(); self.crs_table.setModel(self.crs_model)
+        self.crs_table.setSelectionBehavior(QTableView.SelectRows)
         self.tabs.addTab(self.stu_table, "Students")
         self.tabs.addTab(self.ins_table, "Instructors")
         self.tabs.addTab(self.crs_table, "Courses")
@@ -360,67 +654,97 @@ class SchoolQt(QMainWindow):
         wrap = QWidget(); v = QVBoxLayout(wrap); v.addWidget(self.tabs); v.addWidget(ctl)
         return wrap
     def _refresh_dropdowns(self):
-        # Update dropdowns with current data
-        self.c_instructor.clear()
-        self.c_instructor.addItems([f"{iid} | {ins.name}" for iid, ins in self.dm.instructors.items()])
-        self.reg_student.clear()
-        self.reg_student.addItems([f"{sid} | {s.name}" for sid, s in self.dm.students.items()])
-        self.reg_course.clear()
-        self.reg_course.addItems([f"{cid} | {c.course_name}" for cid, c in self.dm.courses.items()])
-        self.asg_instructor.clear()
-        self.asg_instructor.addItems([f"{iid} | {ins.name}" for iid, ins in self.dm.instructors.items()])
-        self.asg_course.clear()
-        self.asg_course.addItems([f"{cid} | {c.course_name}" for cid, c in self.dm.courses.items()])
-    def _refresh_tables(self, q: str = ""):
-        # Refresh all tables based on search query
+        # Update dropdowns with current data; unchanged lists are left alone
+        for model, rows in (
+            (self._instructor_list, [(f"{iid} | {ins.name}", iid) for iid, ins in self.dm.instructors.items()]),
+            (self._student_list, [(f"{sid} | {s.name}", sid) for sid, s in self.dm.students.items()]),
+            (self._course_list, [(f"{cid} | {c.course_name}", cid) for cid, c in self.dm.courses.items()]),
+        ):
+            if rows == self._dropdown_rows.get(id(model)):
+                continue
+            self._dropdown_rows[id(model)] = rows
+            items = []
+            for label, key in rows:
+                item = QStandardItem(label); item.setData(key, Qt.UserRole); items.append(item)
+            model.clear(); model.appendColumn(items)
+    def _refresh_tables(self, q: str = "", kinds=("students", "instructors", "courses")):
+        # Refresh the given tables based on search query
         q = q.lower().strip()
-        self.stu_table.setRowCount(0)
-        for sid, s in self.dm.students.items():
-            courses_str = ", ".join([c.course_id for c in s.registered_courses])
-            if not q or q in sid.lower() or q in s.name.lower() or q in courses_str.lower():
-                r = self.stu_table.rowCount(); self.stu_table.insertRow(r)
-                for col, val in enumerate([sid, s.name, str(s.age), s._email, courses_str]):
-                    self.stu_table.setItem(r, col, QTableWidgetItem(val))
-        self.ins_table.setRowCount(0)
-        for iid, ins in self.dm.instructors.items():
-            courses_str = ", ".join([c.course_id for c in ins.assigned_courses])
-            if not q or q in iid.lower() or q in ins.name.lower() or q in courses_str.lower():
-                r = self.ins_table.rowCount(); self.ins_table.insertRow(r)
-                for col, val in enumerate([iid, ins.name, str(ins.age), ins._email, courses_str]):
-                    self.ins_table.setItem(r, col, QTableWidgetItem(val))
-        self.crs_table.setRowCount(0)
-        for cid, c in self.dm.courses.items():
-            students_str = ", ".join([s.student_id for s in c.enrolled_students])
-            instr_label = f"{c.instructor.instructor_id} - {c.instructor.name}"
-            if not q or q in cid.lower() or q in c.course_name.lower() or q in students_str.lower():
-                r = self.crs_table.rowCount(); self.crs_table.insertRow(r)
-                for col, val in enumerate([cid, c.course_name, instr_label, students_str]):
-                    self.crs_table.setItem(r, col, QTableWidgetItem(val))
+        views = {"students": (self.stu_table, self._refresh_students_table),
+                 "instructors": (self.ins_table, self._refresh_instructors_table),
+                 "courses": (self.crs_table, self._refresh_courses_table)}
+        tables = [views[k][0] for k in kinds]
+        # Hold back repaints until all models are reset
+        for table in tables:
+            table.setUpdatesEnabled(False)
+        try:
+            for k in kinds:
+                views[k][1](q)
+        finally:
+            for table in tables:
+                table.setUpdatesEnabled(True)
+    def _refresh_students_table(self, q: str):
+        self._reset_model(self.stu_model, "students", self.dm.students, q)
+    def _refresh_instructors_table(self, q: str):
+        self._reset_model(self.ins_model, "instructors", self.dm.instructors, q)
+    def _refresh_courses_table(self, q: str):
+        self._reset_model(self.crs_model, "courses", self.dm.courses, q)
+    def _reset_model(self, model: "_EntityModel", kind: str, entities: Dict[str, Any], q: str):
+        # Point one table model at the rows matching q
+        if self.arrow is not None:
+            model.reset(self.dm, table=self.arrow.filter(kind, q))
+            return
+        # The model is sized once from the id list; no per-row inserts
+        if not q:
+            ids = list(entities)
+        else:
+            ids = [key for key, x in entities.items() if q in x.search_blob]
+        model.reset(self.dm, ids)
+    def _resize_columns(self):
+        # Fit column widths to the current contents
+        self._resize_pending = False
         for table in (self.stu_table, self.ins_table, self.crs_table):
             table.resizeColumnsToContents()
+    def _mark_dirty(self, *kinds: str):
+        # Flag tabs (and/or "dropdowns") for the next _refresh_all and invalidate the save snapshot
+        for k in kinds: self._dirty[k] = True
+        self.dm.mark_dirty()
     def _refresh_all(self):
-        # Refresh dropdowns and tables
-        self._refresh_dropdowns()
-        self._refresh_tables()
+        # Refresh the dropdowns and tables flagged dirty since the last refresh
+        kinds = [k for k in ("students", "instructors", "courses") if self._dirty[k]]
+        if self._dirty["dropdowns"]: self._refresh_dropdowns()
+        if self.arrow is not None and kinds:
+            self.arrow.build(self.dm, kinds)
+        self._refresh_tables(self.search_edit.text(), kinds)
+        self._dirty = dict.fromkeys(self._dirty, False)
+        # Column widths follow data changes only (not search refilters), recomputed once
+        # the event loop is idle
+        if kinds and not self._resize_pending:
+            self._resize_pending = True
+            QTimer.singleShot(0, self._resize_columns)
     def _apply_search(self):
         # Apply search filter
         self._refresh_tables(self.search_edit.text())
     def _clear_search(self):
         # Clear search filter
         self.search_edit.setText("")
+        self._search_timer.stop()
         self._refresh_tables("")
     def _parse_int(self, s: str, field: str) -> int:
-        # Parse integer from string, raise error if invalid
+        # Parse integer from string, raise error if invalid; plain digits skip the exception path
+        s = s.strip()
+        if s.isdecimal():
+            return int(s)
         try:
-            return int(s.strip())
-        except:
-            raise ValueError(f"{field} must be an integer")
-    def _selected_row_values(self, table: QTableWidget) -> List[str]:
+            return int(s)
+        except ValueError:
+            raise ValueError(f"{field} must be an integer") from None
+    def _selected_row_values(self, table: QTableView) -> List[str]:
         # Get values from the selected row in a table
         rows = table.selectionModel().selectedRows()
         if not rows: return []
-        row = rows[0].row()
-        return [table.item(row, c).text() if table.item(row, c) else "" for c in range(table.columnCount())]
+        row = rows[0].row(); model = table.model()
+        return [model.data(model.index(row, c)) or "" for c in range(model.columnCount())]
     def _add_or_update_student(self):
         # Add or update a student based on form input
         try:
@@ -433,17 +757,27 @@ class SchoolQt(QMainWindow):
                     raise ValueError(f"Email already in use: {email}")
                 stu = Student(name, age, email, sid)
                 self.dm.add_student(stu)
+                kinds = ("students", "dropdowns")
             else:
                 sid_key = self.edit_mode["students"]
                 stu = self.dm.students[sid_key]
                 if sid != sid_key and sid in self.dm.students: raise ValueError(f"Duplicate student_id: {sid}")
-                validate_nonempty_str(name, "name"); validate_nonneg_int(age, "age"); validate_email(email); validate_nonempty_str(sid, "student_id")
-                if self.dm.email_in_use(email, exclude_kind="student", exclude_id=sid_key):
-                    raise ValueError(f"Email already in use: {email}")
+                validate_nonempty_str(name, "name"); validate_nonneg_int(age, "age"); validate_nonempty_str(sid, "student_id")
+                if email != stu._email:
+                    validate_email(email)
+                    if self.dm.email_in_use(email, exclude_kind="student", exclude_id=sid_key):
+                        raise ValueError(f"Email already in use: {email}")
+                old_email = stu._email
+                kinds = ["students"]
+                if name != stu.name or sid != sid_key: kinds.append("dropdowns")
+                if sid != sid_key: kinds.append("courses")
                 stu.name = name; stu.age = age; stu._email = email
                 if sid != sid_key:
                     self.dm.students.pop(sid_key); self.dm.students[sid] = stu; stu.student_id = sid
-            self._clear_form("students"); self._refresh_all()
+                    for c in stu.registered_courses.values(): _rekey(c.enrolled_students, sid_key, sid); c.invalidate_cache()
+                self.dm.update_email_owner(old_email, email, "student", sid)
+                stu.invalidate_cache()
+            self._clear_form("students"); self._mark_dirty(*kinds); self._refresh_all()
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
     def _add_or_update_instructor(self):
@@ -458,17 +792,26 @@ class SchoolQt(QMainWindow):
                     raise ValueError(f"Email already in use: {email}")
                 ins = Instructor(name, age, email, iid)
                 self.dm.add_instructor(ins)
+                kinds = ("instructors", "dropdowns")
             else:
                 iid_key = self.edit_mode["instructors"]
                 ins = self.dm.instructors[iid_key]
                 if iid != iid_key and iid in self.dm.instructors: raise ValueError(f"Duplicate instructor_id: {iid}")
-                validate_nonempty_str(name, "name"); validate_nonneg_int(age, "age"); validate_email(email); validate_nonempty_str(iid, "instructor_id")
-                if self.dm.email_in_use(email, exclude_kind="instructor", exclude_id=iid_key):
-                    raise ValueError(f"Email already in use: {email}")
+                validate_nonempty_str(name, "name"); validate_nonneg_int(age, "age"); validate_nonempty_str(iid, "instructor_id")
+                if email != ins._email:
+                    validate_email(email)
+                    if self.dm.email_in_use(email, exclude_kind="instructor", exclude_id=iid_key):
+                        raise ValueError(f"Email already in use: {email}")
+                old_email = ins._email
+                kinds = ["instructors"]
+                # Course rows show the instructor as "id - name"
+                if name != ins.name or iid != iid_key: kinds += ["dropdowns", "courses"]
                 ins.name = name; ins.age = age; ins._email = email
                 if iid != iid_key:
                     self.dm.instructors.pop(iid_key); self.dm.instructors[iid] = ins; ins.instructor_id = iid
-            self._clear_form("instructors"); self._refresh_all()
+                self.dm.update_email_owner(old_email, email, "instructor", iid)
+                ins.invalidate_cache()
+            self._clear_form("instructors"); self._mark_dirty(*kinds); self._refresh_all()
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
     def _add_or_update_course(self):
@@ -476,50 +819,52 @@ class SchoolQt(QMainWindow):
         try:
             cid = self.c_id.text().strip()
             cname = self.c_name.text().strip()
-            ins_label = self.c_instructor.currentText().strip()
-            if not ins_label: raise ValueError("Please select an instructor")
-            ins_id = ins_label.split(" | ")[0]
+            ins_id = self.c_instructor.currentData()
+            if not ins_id: raise ValueError("Please select an instructor")
             instructor = self.dm.instructors.get(ins_id)
             if instructor is None: raise ValueError("Instructor not found")
             if self.edit_mode["courses"] is None:
                 course = Course(cid, cname, instructor)
                 self.dm.add_course(course)
+                kinds = ("courses", "instructors", "dropdowns")
             else:
                 cid_key = self.edit_mode["courses"]
                 course = self.dm.courses[cid_key]
                 if cid != cid_key and cid in self.dm.courses: raise ValueError(f"Duplicate course_id: {cid}")
                 validate_nonempty_str(cname, "course_name")
+                kinds = ["courses", "instructors"]
+                if cname != course.course_name or cid != cid_key: kinds.append("dropdowns")
+                if cid != cid_key: kinds.append("students")
                 course.course_name = cname
                 course.set_instructor(instructor)
                 if cid != cid_key:
                     self.dm.courses.pop(cid_key); self.dm.courses[cid] = course; course.course_id = cid
-            self._clear_form("courses"); self._refresh_all()
+                    for st in course.enrolled_students.values(): _rekey(st.registered_courses, cid_key, cid); st.invalidate_cache()
+                    _rekey(course.instructor.assigned_courses, cid_key, cid); course.instructor.invalidate_cache()
+                course.invalidate_cache()
+            self._clear_form("courses"); self._mark_dirty(*kinds); self._refresh_all()
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
     def _register_student_to_course(self):
         # Register a student to a selected course
         try:
-            s_label = self.reg_student.currentText().strip()
-            c_label = self.reg_course.currentText().strip()
-            if not s_label or not c_label: raise ValueError("Select a student and a course")
-            sid = s_label.split(" | ")[0]; cid = c_label.split(" | ")[0]
+            sid = self.reg_student.currentData(); cid = self.reg_course.currentData()
+            if not sid or not cid: raise ValueError("Select a student and a course")
             stu = self.dm.students.get(sid); crs = self.dm.courses.get(cid)
             if not stu or not crs: raise ValueError("Invalid selection")
             crs.add_student(stu)
-            self._refresh_all()
+            self._mark_dirty("students", "courses"); self._refresh_all()
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
     def _assign_instructor_to_course(self):
         # Assign an instructor to a selected course
         try:
-            i_label = self.asg_instructor.currentText().strip()
-            c_label = self.asg_course.currentText().strip()
-            if not i_label or not c_label: raise ValueError("Select an instructor and a course")
-            iid = i_label.split(" | ")[0]; cid = c_label.split(" | ")[0]
+            iid = self.asg_instructor.currentData(); cid = self.asg_course.currentData()
+            if not iid or not cid: raise ValueError("Select an instructor and a course")
             ins = self.dm.instructors.get(iid); crs = self.dm.courses.get(cid)
             if not ins or not crs: raise ValueError("Invalid selection")
             crs.set_instructor(ins)
-            self._refresh_all()
+            self._mark_dirty("courses", "instructors"); self._refresh_all()
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
     def _edit_selected(self):
@@ -540,14 +885,11 @@ class SchoolQt(QMainWindow):
         elif tab is self.crs_table:
             vals = self._selected_row_values(self.crs_table)
             if not vals: QMessageBox.information(self,"Info","Select a course row to edit."); return
-            cid, cname, instr = vals[0], vals[1], vals[2]
+            cid, cname = vals[0], vals[1]
             self.c_id.setText(cid); self.c_name.setText(cname)
-            try:
-                iid = instr.split(" - ")[0]; ins = self.dm.instructors[iid]
-                label = f"{iid} | {ins.name}"; idx = self.c_instructor.findText(label)
-                if idx >= 0: self.c_instructor.setCurrentIndex(idx)
-            except:
-                pass
+            row = self.crs_table.selectionModel().selectedRows()[0].row()
+            idx = self.c_instructor.findData(self.crs_model.data(self.crs_model.index(row, 2), Qt.UserRole))
+            if idx >= 0: self.c_instructor.setCurrentIndex(idx)
             self.edit_mode["courses"] = cid; self.c_add_btn.setText("Update Course")
     def _delete_selected(self):
         # Delete the selected row in the current table
@@ -558,31 +900,35 @@ class SchoolQt(QMainWindow):
                 if not vals: QMessageBox.information(self,"Info","Select a student row to delete."); return
                 sid = vals[0]; stu = self.dm.students.get(sid)
                 if stu:
-                    for c in list(stu.registered_courses):
-                        if stu in c.enrolled_students: c.enrolled_students.remove(stu)
+                    for c in stu.registered_courses.values():
+                        c.enrolled_students.pop(sid, None); c.invalidate_cache()
                     self.dm.students.pop(sid, None)
+                    self.dm.release_email(stu._email)
+                    self._mark_dirty("students", "courses", "dropdowns")
             elif tab is self.ins_table:
                 vals = self._selected_row_values(self.ins_table)
                 if not vals: QMessageBox.information(self,"Info","Select an instructor row to delete."); return
                 iid = vals[0]; ins = self.dm.instructors.get(iid)
                 if ins:
-                    for c in list(ins.assigned_courses):
+                    for c in list(ins.assigned_courses.values()):
                         try:
                             c.instructor = ins
                         except:
                             pass
                     self.dm.instructors.pop(iid, None)
+                    self.dm.release_email(ins._email)
+                    self._mark_dirty("instructors", "courses", "dropdowns")
                     QMessageBox.warning(self, "Warning", "Deleted instructor. Reassign affected courses.")
             elif tab is self.crs_table:
                 vals = self._selected_row_values(self.crs_table)
                 if not vals: QMessageBox.information(self,"Info","Select a course row to delete."); return
                 cid = vals[0]; crs = self.dm.courses.get(cid)
                 if crs:
-                    for s in list(crs.enrolled_students):
-                        if crs in s.registered_courses: s.registered_courses.remove(crs)
-                    if crs in crs.instructor.assigned_courses:
-                        crs.instructor.assigned_courses.remove(crs)
+                    for s in crs.enrolled_students.values():
+                        s.registered_courses.pop(cid, None); s.invalidate_cache()
+                    crs.instructor.assigned_courses.pop(cid, None); crs.instructor.invalidate_cache()
                     self.dm.courses.pop(cid, None)
+                    self._mark_dirty("courses", "students", "instructors", "dropdowns")
             self._clear_form("students"); self._clear_form("instructors"); self._clear_form("courses")
             self._refresh_all()
         except Exception as e:
@@ -603,7 +949,10 @@ class SchoolQt(QMainWindow):
         path, _ = QFileDialog.getSaveFileName(self, "Save Data", "", "JSON Files (*.json)")
         if not path: return
         try:
-            self.dm.save_json(path)
+            snap = self._save_snapshot
+            if snap is None or snap[0] is not self.dm or snap[1] != self.dm.version:
+                snap = self._save_snapshot = (self.dm, self.dm.version, self.dm.to_dict())
+            self.dm.save_json(path, snap[2])
             QMessageBox.information(self, "Saved", f"Saved to {path}")
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
@@ -614,7 +963,7 @@ class SchoolQt(QMainWindow):
         try:
             self.dm = DataManager.load_json(path)
             self._clear_form("students"); self._clear_form("instructors"); self._clear_form("courses")
-            self._refresh_all()
+            self._mark_dirty("students", "instructors", "courses", "dropdowns"); self._refresh_all()
             QMessageBox.information(self, "Loaded", f"Loaded from {path}")
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
@@ -625,16 +974,16 @@ class SchoolQt(QMainWindow):
         try:
             with open(f"{folder}/students.csv", "w", newline="", encoding="utf-8") as f:
                 w = csv.writer(f); w.writerow(["student_id","name","age","email","registered_courses"])
-                for s in self.dm.students.values():
-                    w.writerow([s.student_id, s.name, s.age, s._email, " ".join([c.course_id for c in s.registered_courses])])
+                w.writerows((s.student_id, s.name, s.age, s._email, " ".join(s.registered_courses))
+                            for s in self.dm.students.values())
             with open(f"{folder}/instructors.csv", "w", newline="", encoding="utf-8") as f:
                 w = csv.writer(f); w.writerow(["instructor_id","name","age","email","assigned_courses"])
-                for ins in self.dm.instructors.values():
-                    w.writerow([ins.instructor_id, ins.name, ins.age, ins._email, " ".join([c.course_id for c in ins.assigned_courses])])
+                w.writerows((ins.instructor_id, ins.name, ins.age, ins._email, " ".join(ins.assigned_courses))
+                            for ins in self.dm.instructors.values())
             with open(f"{folder}/courses.csv", "w", newline="", encoding="utf-8") as f:
                 w = csv.writer(f); w.writerow(["course_id","course_name","instructor_id","instructor_name","enrolled_students"])
-                for c in self.dm.courses.values():
-                    w.writerow([c.course_id, c.course_name, c.instructor.instructor_id, c.instructor.name, " ".join([s.student_id for s in c.enrolled_students])])
+                w.writerows((c.course_id, c.course_name, c.instructor.instructor_id, c.instructor.name, " ".join(c.enrolled_students))
+                            for c in self.dm.courses.values())
             QMessageBox.information(self, "Exported", f"CSV files saved in {folder}")
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
@@ -1,10 +1,11 @@
-import sys, json, csv, re, sqlite3  # Standard libraries
+import sys, os, json, csv, re, sqlite3  # Standard libraries
 from typing import List
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox,QLabel, QLineEdit, QPushButton, QComboBox, QTabWidget, QTableWidget, QTableWidgetItem,QMessageBox, QFileDialog, QAction, QToolBar)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox,QLabel, QLineEdit, QPushButton, QComboBox, QTabWidget, QTableView, QHeaderView,QMessageBox, QFileDialog, QAction, QToolBar)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
 from db import DB, create_schema  # Database helpers
 
-EMAIL_REGEX = re.compile(r"^[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}$")  # Simple email validation
+EMAIL_REGEX = re.compile(r"\A[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\Z")  # Simple email validation
+EMAIL_MAX_LEN = 254  # RFC 5321 limit; also caps regex backtracking on hostile input
 
 def validate_nonempty_str(value: str, field: str):
     """Raise error if value is not a non-empty string."""
@@ -18,9 +19,47 @@ def validate_nonneg_int(value: int, field: str):
 
 def validate_email(email: str):
     """Raise error if email is not valid."""
-    if not isinstance(email, str) or not EMAIL_REGEX.match(email):
+    if (not isinstance(email, str) or len(email) > EMAIL_MAX_LEN or "@" not in email
+            or not EMAIL_REGEX.fullmatch(email)):
         raise ValueError(f"Invalid email: {email}")
 
+def write_csv(f, header: List[str], rows):
+    """Write header and rows as CSV, streaming rows straight from the iterable."""
+    w = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+    w.writerow(header)
+    w.writerows(rows)
+
+class RowsModel(QAbstractTableModel):
+    """
+    Read-only table model over a list of row tuples.
+    Each refresh swaps the whole list in with a single model reset.
+    """
+    def __init__(self, headers: List[str]):
+        super().__init__()
+        self.headers = headers
+        self._rows: List[tuple] = []
+    def set_rows(self, rows: List[tuple]):
+        """Replace all rows at once."""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+    def row(self, r: int) -> tuple:
+        """Full tuple behind row r, including any columns past the headers."""
+        return self._rows[r]
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        val = self._rows[index.row()][index.column()]
+        return "" if val is None else str(val)
+
 class SchoolQt(QMainWindow):
     """
     Main window for the school management system.
@@ -34,8 +73,15 @@ class SchoolQt(QMainWindow):
         create_schema("school.sqlite")
         self.db = DB("school.sqlite")
         self.edit_mode = {"students": None, "instructors": None, "courses": None}
+        # Bumped whenever the DB changes; a search with the same query and version is skipped
+        self._data_version = 0
+        self._last_refresh = None
+        # Row lists the dropdowns were last built from, keyed by table
+        self._dropdown_src = {}
+        self._refresh_pending = False
         self._build_ui()
         self._refresh_all()
+        self._fit_columns()
 
     def _build_ui(self):
         # Build all UI sections
@@ -53,8 +99,9 @@ class SchoolQt(QMainWindow):
         save_act = QAction("Save Snapshot (JSON)...", self); save_act.triggered.connect(self._save_json)
         load_act = QAction("Load Snapshot (JSON)...", self); load_act.triggered.connect(self._load_json)
         export_act = QAction("Export CSV...", self); export_act.triggered.connect(self._export_csv)
+        fit_act = QAction("Fit Columns", self); fit_act.triggered.connect(self._fit_columns)
         toolbar = QToolBar("Main"); self.addToolBar(toolbar)
-        toolbar.addAction(save_act); toolbar.addAction(load_act); toolbar.addAction(export_act)
+        toolbar.addAction(save_act); toolbar.addAction(load_act); toolbar.addAction(export_act); toolbar.addAction(fit_act)
 
     def _forms_section(self):
         # Build forms for adding/editing entities
@@ -130,6 +177,10 @@ class SchoolQt(QMainWindow):
         layout = QHBoxLayout()
         layout.addWidget(QLabel("Search (Name / ID / Course):"))
         self.search_edit = QLineEdit()
+        # Search as you type, once typing pauses for 150 ms
+        self._search_timer = QTimer(self); self._search_timer.setSingleShot(True); self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._apply_search)
+        self.search_edit.textChanged.connect(lambda _: self._search_timer.start())
         go = QPushButton("Search"); go.clicked.connect(self._apply_search)
         clr = QPushButton("Clear"); clr.clicked.connect(self._clear_search)
         layout.addWidget(self.search_edit); layout.addWidget(go); layout.addWidget(clr); layout.addStretch(1)
@@ -138,15 +189,16 @@ class SchoolQt(QMainWindow):
     def _tables_section(self):
         # Tables for displaying students, instructors, and courses
         self.tabs = QTabWidget()
-        self.stu_table = QTableWidget(0,5)
-        self.stu_table.setHorizontalHeaderLabels(["Student ID","Name","Age","Email","Courses"])
-        self.stu_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.ins_table = QTableWidget(0,5)
-        self.ins_table.setHorizontalHeaderLabels(["Instructor ID","Name","Age","Email","Courses"])
-        self.ins_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.crs_table = QTableWidget(0,4)
-        self.crs_table.setHorizontalHeaderLabels(["Course ID","Course Name","Instructor","Students"])
-        self.crs_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.stu_model = RowsModel(["Student ID","Name","Age","Email","Courses"])
+        self.ins_model = RowsModel(["Instructor ID","Name","Age","Email","Courses"])
+        self.crs_model = RowsModel(["Course ID","Course Name","Instructor","Students"])
+        self.stu_table = QTableView(); self.stu_table.setModel(self.stu_model)
+        self.ins_table = QTableView(); self.ins_table.setModel(self.ins_model)
+        self.crs_table = QTableView(); self.crs_table.setModel(self.crs_model)
+        for table in (self.stu_table, self.ins_table, self.crs_table):
+            table.setSelectionBehavior(QTableView.SelectRows)
+            # Widths are fitted once at startup and on demand, not on every refresh
+            table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         self.tabs.addTab(self.stu_table, "Students")
         self.tabs.addTab(self.ins_table, "Instructors")
         self.tabs.addTab(self.crs_table, "Courses")
@@ -158,55 +210,82 @@ class SchoolQt(QMainWindow):
         return wrap
 
     def _refresh_dropdowns(self):
-        # Update dropdowns with current data from DB
-        self.c_instructor.clear()
-        self.c_instructor.addItems([f"{i['instructor_id']} | {i['name']}" for i in self.db.list_instructors()])
-        self.reg_student.clear()
-        self.reg_student.addItems([f"{s['student_id']} | {s['name']}" for s in self.db.list_students()])
-        self.reg_course.clear()
-        self.reg_course.addItems([f"{c['course_id']} | {c['course_name']}" for c in self.db.list_courses()])
-        self.asg_instructor.clear()
-        self.asg_instructor.addItems([f"{i['instructor_id']} | {i['name']}" for i in self.db.list_instructors()])
-        self.asg_course.clear()
-        self.asg_course.addItems([f"{c['course_id']} | {c['course_name']}" for c in self.db.list_courses()])
+        # Update dropdowns with current data from DB; each item carries its id as userData.
+        # list_* hand back the same list object while their tables are unchanged, so an
+        # unchanged table is neither reformatted nor re-added to its combos.
+        for name, rows, id_col, name_col, combos in (
+            ("instructors", self.db.list_instructors(), "instructor_id", "name", (self.c_instructor, self.asg_instructor)),
+            ("students", self.db.list_students(), "student_id", "name", (self.reg_student,)),
+            ("courses", self.db.list_courses(), "course_id", "course_name", (self.reg_course, self.asg_course)),
+        ):
+            if rows is self._dropdown_src.get(name):
+                continue
+            self._dropdown_src[name] = rows
+            # Labels are formatted once per table and shared by its combos
+            items = [(f"{r[id_col]} | {r[name_col]}", r[id_col]) for r in rows]
+            for combo in combos:
+                # No currentIndexChanged or repaints while the items are rebuilt
+                combo.blockSignals(True); combo.setUpdatesEnabled(False)
+                try:
+                    combo.clear()
+                    for label, key in items:
+                        combo.addItem(label, key)
+                finally:
+                    combo.setUpdatesEnabled(True); combo.blockSignals(False)
 
     def _refresh_tables(self, q: str = ""):
-        # Refresh all tables based on search query
-        q = q.lower().strip()
-        self.stu_table.setRowCount(0)
-        for s in self.db.list_students():
-            courses = ", ".join(self.db.list_student_courses(s["student_id"]))
-            if not q or q in s["student_id"].lower() or q in s["name"].lower() or q in courses.lower():
-                r = self.stu_table.rowCount(); self.stu_table.insertRow(r)
-                for col, val in enumerate([s["student_id"], s["name"], str(s["age"]), s["email"], courses]):
-                    self.stu_table.setItem(r, col, QTableWidgetItem(val))
-        self.ins_table.setRowCount(0)
-        for ins in self.db.list_instructors():
-            rows = self.db.conn.execute(
-                "SELECT course_id FROM courses WHERE instructor_id=? ORDER BY course_id",
-                (ins["instructor_id"],)
-            ).fetchall()
-            courses_str = ", ".join([r["course_id"] for r in rows])
-            if not q or q in ins["instructor_id"].lower() or q in ins["name"].lower() or q in courses_str.lower():
-                r = self.ins_table.rowCount(); self.ins_table.insertRow(r)
-                for col, val in enumerate([ins["instructor_id"], ins["name"], str(ins["age"]), ins["email"], courses_str]):
-                    self.ins_table.setItem(r, col, QTableWidgetItem(val))
-        self.crs_table.setRowCount(0)
-        for c in self.db.list_courses():
-            students_str = ", ".join(self.db.list_course_students(c["course_id"]))
-            instr_label = f"{c['instructor_id'] or ''} - {c.get('instructor_name') or ''}"
-            if not q or q in c["course_id"].lower() or q in c["course_name"].lower() or q in students_str.lower():
-                r = self.crs_table.rowCount(); self.crs_table.insertRow(r)
-                for col, val in enumerate([c["course_id"], c["course_name"], instr_label, students_str]):
-                    self.crs_table.setItem(r, col, QTableWidgetItem(val))
+        # Refresh all tables based on search query; filtering happens in SQL
+        q = q.strip()
+        if (q, self._data_version) == self._last_refresh:
+            return
+        self._last_refresh = (q, self._data_version)
+        if q:
+            students = self.db.search_students(q)
+            instructors = self.db.search_instructors(q)
+            courses = self.db.search_courses(q)
+        else:
+            students = self.db.list_students_with_courses()
+            instructors = self.db.list_instructors_with_courses()
+            courses = self.db.list_courses_with_students()
+        # The trailing instructor_id is not shown (past the last header) but lets edits skip label parsing
+        crs_rows = [(c["course_id"], c["course_name"],
+                     f"{c['instructor_id'] or ''} - {c['instructor_name'] or ''}", c["students"], c["instructor_id"])
+                    for c in courses]
+        tables = (self.stu_table, self.ins_table, self.crs_table)
+        # Suppress intermediate paints while the three models are swapped
+        for table in tables:
+            table.setUpdatesEnabled(False)
+        try:
+            self.stu_model.set_rows([tuple(s) for s in students])
+            self.ins_model.set_rows([tuple(i) for i in instructors])
+            self.crs_model.set_rows(crs_rows)
+        finally:
+            for table in tables:
+                table.setUpdatesEnabled(True)
+
+    def _fit_columns(self):
+        # Size every column to its current contents (one full sweep of the cells)
         for table in (self.stu_table, self.ins_table, self.crs_table):
             table.resizeColumnsToContents()
 
     def _refresh_all(self):
-        # Refresh dropdowns and tables
+        # Refresh dropdowns and tables; called after every change to the DB
+        self._data_version += 1
         self._refresh_dropdowns()
         self._refresh_tables()
 
+    def _schedule_refresh(self):
+        # Refresh once control returns to the event loop; back-to-back mutations share one refresh
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            QTimer.singleShot(0, self._maybe_refresh)
+
+    def _maybe_refresh(self):
+        # Run the refresh requested by _schedule_refresh, if still pending
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self._refresh_all()
+
     def _apply_search(self):
         # Apply search filter
         self._refresh_tables(self.search_edit.text())
@@ -214,21 +293,25 @@ class SchoolQt(QMainWindow):
     def _clear_search(self):
         # Clear search filter
         self.search_edit.setText("")
+        self._search_timer.stop()
         self._refresh_tables("")
 
     def _parse_int(self, s: str, field: str) -> int:
-        # Parse integer from string, raise error if invalid
+        # Parse integer from string, raise error if invalid; plain digits skip the exception path
+        s = s.strip()
+        if s.isdecimal():
+            return int(s)
         try:
-            return int(s.strip())
-        except:
-            raise ValueError(f"{field} must be an integer")
+            return int(s)
+        except ValueError:
+            raise ValueError(f"{field} must be an integer") from None
 
-    def _selected_row_values(self, table: QTableWidget) -> List[str]:
+    def _selected_row_values(self, table: QTableView) -> List[str]:
         # Get values from the selected row in a table
         rows = table.selectionModel().selectedRows()
         if not rows: return []
-        row = rows[0].row()
-        return [table.item(row, c).text() if table.item(row, c) else "" for c in range(table.columnCount())]
+        row = rows[0].row(); model = table.model()
+        return [model.data(model.index(row, c)) for c in range(model.columnCount())]
 
     def _add_or_update_student(self):
         # Add or update a student in the database
@@ -242,11 +325,11 @@ class SchoolQt(QMainWindow):
                 self.db.create_student(sid, name, age, email)
             else:
                 sid_key = self.edit_mode["students"]
-                self.db.update_student(sid_key, name, age, email)
                 if sid != sid_key:
-                    self.db.delete_student(sid)
-                    self.db.create_student(sid, name, age, email)
-            self._clear_form("students"); self._refresh_all()
+                    self.db.rename_student(sid_key, sid, name, age, email)
+                else:
+                    self.db.update_student(sid_key, name, age, email)
+            self._clear_form("students"); self._schedule_refresh()
         except sqlite3.IntegrityError as e:
             QMessageBox.critical(self, "Error", f"DB constraint failed: {e}")
         except Exception as e:
@@ -264,11 +347,11 @@ class SchoolQt(QMainWindow):
                 self.db.create_instructor(iid, name, age, email)
             else:
                 iid_key = self.edit_mode["instructors"]
-                self.db.update_instructor(iid_key, name, age, email)
                 if iid != iid_key:
-                    self.db.delete_instructor(iid)
-                    self.db.create_instructor(iid, name, age, email)
-            self._clear_form("instructors"); self._refresh_all()
+                    self.db.rename_instructor(iid_key, iid, name, age, email)
+                else:
+                    self.db.update_instructor(iid_key, name, age, email)
+            self._clear_form("instructors"); self._schedule_refresh()
         except sqlite3.IntegrityError as e:
             QMessageBox.critical(self, "Error", f"DB constraint failed: {e}")
         except Exception as e:
@@ -279,19 +362,18 @@ class SchoolQt(QMainWindow):
         try:
             cid = self.c_id.text().strip()
             cname = self.c_name.text().strip()
-            ins_label = self.c_instructor.currentText().strip()
+            ins_id = self.c_instructor.currentData()
             validate_nonempty_str(cid,"course_id"); validate_nonempty_str(cname,"course_name")
-            if not ins_label: raise ValueError("Please select an instructor")
-            ins_id = ins_label.split(" | ")[0]
+            if not ins_id: raise ValueError("Please select an instructor")
             if self.edit_mode["courses"] is None:
                 self.db.create_course(cid, cname, ins_id)
             else:
                 cid_key = self.edit_mode["courses"]
-                self.db.update_course(cid_key, course_name=cname, instructor_id=ins_id)
                 if cid != cid_key:
-                    self.db.delete_course(cid)
-                    self.db.create_course(cid, cname, ins_id)
-            self._clear_form("courses"); self._refresh_all()
+                    self.db.rename_course(cid_key, cid, cname, ins_id)
+                else:
+                    self.db.update_course(cid_key, course_name=cname, instructor_id=ins_id)
+            self._clear_form("courses"); self._schedule_refresh()
         except sqlite3.IntegrityError as e:
             QMessageBox.critical(self, "Error", f"DB constraint failed: {e}")
         except Exception as e:
@@ -300,12 +382,10 @@ class SchoolQt(QMainWindow):
     def _register_student_to_course(self):
         # Register a student to a selected course
         try:
-            s_label = self.reg_student.currentText().strip()
-            c_label = self.reg_course.currentText().strip()
-            if not s_label or not c_label: raise ValueError("Select a student and a course")
-            sid = s_label.split(" | ")[0]; cid = c_label.split(" | ")[0]
+            sid = self.reg_student.currentData(); cid = self.reg_course.currentData()
+            if not sid or not cid: raise ValueError("Select a student and a course")
             self.db.register_student(sid, cid)
-            self._refresh_all()
+            self._schedule_refresh()
         except sqlite3.IntegrityError as e:
             QMessageBox.critical(self, "Error", f"DB constraint failed: {e}")
         except Exception as e:
@@ -314,12 +394,10 @@ class SchoolQt(QMainWindow):
     def _assign_instructor_to_course(self):
         # Assign an instructor to a selected course
         try:
-            i_label = self.asg_instructor.currentText().strip()
-            c_label = self.asg_course.currentText().strip()
-            if not i_label or not c_label: raise ValueError("Select an instructor and a course")
-            iid = i_label.split(" | ")[0]; cid = c_label.split(" | ")[0]
+            iid = self.asg_instructor.currentData(); cid = self.asg_course.currentData()
+            if not iid or not cid: raise ValueError("Select an instructor and a course")
             self.db.update_course(cid, instructor_id=iid)
-            self._refresh_all()
+            self._schedule_refresh()
         except sqlite3.IntegrityError as e:
             QMessageBox.critical(self, "Error", f"DB constraint failed: {e}")
         except Exception as e:
@@ -343,21 +421,11 @@ class SchoolQt(QMainWindow):
         elif tab is self.crs_table:
             vals = self._selected_row_values(self.crs_table)
             if not vals: QMessageBox.information(self,"Info","Select a course row to edit."); return
-            cid, cname, instr = vals[0], vals[1], vals[2]
+            cid, cname = vals[0], vals[1]
             self.c_id.setText(cid); self.c_name.setText(cname)
-            try:
-                iid = (instr.split(" - ")[0]).strip()
-                if iid:
-                    label = None
-                    for i in self.db.list_instructors():
-                        if i["instructor_id"] == iid:
-                            label = f"{iid} | {i['name']}"
-                            break
-                    if label:
-                        idx = self.c_instructor.findText(label)
-                        if idx >= 0: self.c_instructor.setCurrentIndex(idx)
-            except:
-                pass
+            iid = self.crs_model.row(self.crs_table.selectionModel().selectedRows()[0].row())[4]
+            idx = self.c_instructor.findData(iid) if iid else -1
+            if idx >= 0: self.c_instructor.setCurrentIndex(idx)
             self.edit_mode["courses"] = cid; self.c_add_btn.setText("Update Course")
 
     def _delete_selected(self):
@@ -381,7 +449,7 @@ class SchoolQt(QMainWindow):
                 cid = vals[0]
                 self.db.delete_course(cid)
             self._clear_form("students"); self._clear_form("instructors"); self._clear_form("courses")
-            self._refresh_all()
+            self._schedule_refresh()
         except sqlite3.IntegrityError as e:
             QMessageBox.critical(self, "Error", f"DB constraint failed: {e}")
         except Exception as e:
@@ -399,29 +467,13 @@ class SchoolQt(QMainWindow):
             self.c_id.clear(); self.c_name.clear(); self.c_instructor.setCurrentIndex(-1)
             self.edit_mode["courses"] = None; self.c_add_btn.setText("Add Course")
 
-    def _snapshot(self):
-        # Take a snapshot of all data for export
-        students = self.db.list_students()
-        instructors = self.db.list_instructors()
-        courses = self.db.list_courses()
-        regs = [dict(r) for r in self.db.conn.execute("SELECT student_id, course_id FROM registrations ORDER BY student_id, course_id")]
-        return {"students": students, "instructors": instructors, "courses": courses, "registrations": regs}
-
-    def _clear_all_tables(self):
-        # Remove all data from all tables in the DB
-        self.db.conn.execute("DELETE FROM registrations")
-        self.db.conn.execute("DELETE FROM courses")
-        self.db.conn.execute("DELETE FROM students")
-        self.db.conn.execute("DELETE FROM instructors")
-        self.db.conn.commit()
-
     def _save_json(self):
         # Save all data to a JSON file
         path, _ = QFileDialog.getSaveFileName(self, "Save Snapshot", "", "JSON Files (*.json)")
         if not path: return
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(self._snapshot(), f, indent=2)
+            with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                self.db.write_snapshot(f)
             QMessageBox.information(self, "Saved", f"Saved to {path}")
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
@@ -433,17 +485,9 @@ class SchoolQt(QMainWindow):
         try:
             with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
-            self._clear_all_tables()
-            for i in data.get("instructors", []):
-                self.db.create_instructor(i["instructor_id"], i["name"], int(i["age"]), i["email"])
-            for s in data.get("students", []):
-                self.db.create_student(s["student_id"], s["name"], int(s["age"]), s["email"])
-            for c in data.get("courses", []):
-                self.db.create_course(c["course_id"], c["course_name"], c.get("instructor_id"))
-            for r in data.get("registrations", []):
-                self.db.register_student(r["student_id"], r["course_id"])
+            self.db.bulk_load(data)
             self._clear_form("students"); self._clear_form("instructors"); self._clear_form("courses")
-            self._refresh_all()
+            self._schedule_refresh()
             QMessageBox.information(self, "Loaded", f"Loaded from {path}")
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
@@ -453,25 +497,11 @@ class SchoolQt(QMainWindow):
         folder = QFileDialog.getExistingDirectory(self, "Choose Folder to Export CSVs")
         if not folder: return
         try:
-            with open(f"{folder}/students.csv", "w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f); w.writerow(["student_id","name","age","email","registered_courses"])
-                for s in self.db.list_students():
-                    courses = " ".join(self.db.list_student_courses(s["student_id"]))
-                    w.writerow([s["student_id"], s["name"], s["age"], s["email"], courses])
-            with open(f"{folder}/instructors.csv", "w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f); w.writerow(["instructor_id","name","age","email","assigned_courses"])
-                for ins in self.db.list_instructors():
-                    rows = self.db.conn.execute(
-                        "SELECT course_id FROM courses WHERE instructor_id=? ORDER BY course_id",
-                        (ins["instructor_id"],)
-                    ).fetchall()
-                    courses = " ".join([r["course_id"] for r in rows])
-                    w.writerow([ins["instructor_id"], ins["name"], ins["age"], ins["email"], courses])
-            with open(f"{folder}/courses.csv", "w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f); w.writerow(["course_id","course_name","instructor_id","instructor_name","enrolled_students"])
-                for c in self.db.list_courses():
-                    students = " ".join(self.db.list_course_students(c["course_id"]))
-                    w.writerow([c["course_id"], c["course_name"], c["instructor_id"] or "", c.get("instructor_name") or "", students])
+            # One query per file with the id lists joined in SQL; all three read inside one transaction
+            with self.db.transaction():
+                for name, header in DB.EXPORT_HEADERS.items():
+                    with open(os.path.join(folder, f"{name}.csv"), "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+                        write_csv(f, header, self.db.iter_export_rows(name))
             QMessageBox.information(self, "Exported", f"CSV files saved in {folder}")
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
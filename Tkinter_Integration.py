@@ -11,12 +11,16 @@ Course: EECE435L
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import json, csv, re, sqlite3
+import os, json, csv, sqlite3, itertools, threading, queue, functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from db import DB, create_schema
 
-# Regular expression pattern for validating email addresses
-EMAIL_REGEX = re.compile(r"^[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}$")
+# Characters allowed on each side of the "@" in an email address; validate_email accepts
+# exactly what the pattern [A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,} fully matches
+_ASCII_ALNUM = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789")
+EMAIL_LOCAL_CHARS = _ASCII_ALNUM | frozenset("._%+-")
+EMAIL_DOMAIN_CHARS = _ASCII_ALNUM | frozenset(".-")
 
 def validate_nonempty_str(value: str, field: str):
     """
@@ -51,12 +55,19 @@ def validate_email(email: str):
     Validates that an email address matches the required format.
     
     Args:
-        email (str): The email address to validate
+        email (str): The email address to validate; callers pass the stripped Entry text
     
     Raises:
         ValueError: If the email format is invalid
     """
-    if not isinstance(email, str) or not EMAIL_REGEX.match(email):
+    # One linear pass per part instead of a backtracking regex
+    local, at, domain = email.partition("@")
+    dot = domain.rfind(".")
+    tld = domain[dot + 1:]
+    if (not local or not at or dot < 1 or len(tld) < 2
+            or not tld.isascii() or not tld.isalpha()
+            or not EMAIL_LOCAL_CHARS.issuperset(local)
+            or not EMAIL_DOMAIN_CHARS.issuperset(domain)):
         raise ValueError(f"Invalid email: {email}")
 
 class SchoolApp(tk.Tk):
@@ -85,6 +96,25 @@ class SchoolApp(tk.Tk):
         create_schema("school.sqlite")
         self.db = DB("school.sqlite")
         
+        # Pending after_idle jobs that are still filling a treeview, keyed by widget
+        self._fill_jobs = {}
+        
+        # Table data is read by a worker thread on its own connection; results come
+        # back through a queue polled with after(). Only the newest generation is shown.
+        self._last_snapshot = ((), (), ())
+        self._student_labels = self._instructor_labels = self._course_labels = []
+        self._instructor_by_id = {}
+        self._refresh_gen = 0
+        self._last_changes = None  # self.db.conn.total_changes at the last refresh
+        self._refresh_polling = False
+        self._refresh_requests = queue.Queue()
+        self._refresh_results = queue.Queue()
+        threading.Thread(target=self._refresh_worker, daemon=True).start()
+        
+        # File load/save/export run on one I/O thread with its own connection, created there
+        self._io_exec = ThreadPoolExecutor(max_workers=1)
+        self._io_db = None
+        
         # Build all GUI components
         self._build_menu()
         self._build_forms()
@@ -94,7 +124,6 @@ class SchoolApp(tk.Tk):
         
         # Load initial data and setup
         self._refresh_all_views()
-        self._refresh_dropdowns()
         
         # Track which records are being edited
         self.edit_mode = {"students": None, "instructors": None, "courses": None}
@@ -244,84 +273,74 @@ class SchoolApp(tk.Tk):
         self.asg_course_cb.grid(row=3, column=3, padx=5, pady=2)
         ttk.Button(act, text="Assign", command=self._assign_instructor_to_course).grid(row=3, column=4, padx=8)
 
+    # (column, heading, width) for each table
+    STUDENT_COLUMNS = (("id","Student ID",120),("name","Name",180),("age","Age",60),
+                       ("email","Email",220),("courses","Registered Courses",320))
+    INSTRUCTOR_COLUMNS = (("id","Instructor ID",120),("name","Name",180),("age","Age",60),
+                          ("email","Email",220),("courses","Assigned Courses",320))
+    COURSE_COLUMNS = (("id","Course ID",120),("name","Course Name",220),
+                      ("instructor","Instructor",200),("students","Enrolled Students",420))
+
     def _build_notebook(self):
         nb = ttk.Notebook(self)
         nb.pack(fill="both", expand=True, padx=10, pady=10)
-        self.students_tab = ttk.Frame(nb)
-        nb.add(self.students_tab, text="Students")
-        self.students_tab.rowconfigure(0, weight=1)
-        self.students_tab.columnconfigure(0, weight=1)
-        self.students_tv = ttk.Treeview(
-            self.students_tab,
-            columns=("id","name","age","email","courses"),
-            show="headings",
-            selectmode="browse"
-        )
-        for col, txt, w in [
-            ("id","Student ID",120),("name","Name",180),("age","Age",60),
-            ("email","Email",220),("courses","Registered Courses",320)
-        ]:
-            self.students_tv.heading(col, text=txt)
-            self.students_tv.column(col, width=w, anchor="w")
-        stu_y = ttk.Scrollbar(self.students_tab, orient="vertical", command=self.students_tv.yview)
-        stu_x = ttk.Scrollbar(self.students_tab, orient="horizontal", command=self.students_tv.xview)
-        self.students_tv.configure(yscrollcommand=stu_y.set, xscrollcommand=stu_x.set)
-        self.students_tv.grid(row=0, column=0, sticky="nsew", padx=(5,0), pady=(5,0))
-        stu_y.grid(row=0, column=1, sticky="ns", padx=(0,5), pady=(5,0))
-        stu_x.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=(0,5))
-        self.students_tv.bind("<Double-1>", lambda e: self._load_selected_into_form("students"))
-        self.instructors_tab = ttk.Frame(nb)
-        nb.add(self.instructors_tab, text="Instructors")
-        self.instructors_tab.rowconfigure(0, weight=1)
-        self.instructors_tab.columnconfigure(0, weight=1)
-        self.instructors_tv = ttk.Treeview(
-            self.instructors_tab,
-            columns=("id","name","age","email","courses"),
-            show="headings",
-            selectmode="browse"
-        )
-        for col, txt, w in [
-            ("id","Instructor ID",120),("name","Name",180),("age","Age",60),
-            ("email","Email",220),("courses","Assigned Courses",320)
-        ]:
-            self.instructors_tv.heading(col, text=txt)
-            self.instructors_tv.column(col, width=w, anchor="w")
-        ins_y = ttk.Scrollbar(self.instructors_tab, orient="vertical", command=self.instructors_tv.yview)
-        ins_x = ttk.Scrollbar(self.instructors_tab, orient="horizontal", command=self.instructors_tv.xview)
-        self.instructors_tv.configure(yscrollcommand=ins_y.set, xscrollcommand=ins_x.set)
-        self.instructors_tv.grid(row=0, column=0, sticky="nsew", padx=(5,0), pady=(5,0))
-        ins_y.grid(row=0, column=1, sticky="ns", padx=(0,5), pady=(5,0))
-        ins_x.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=(0,5))
-        self.instructors_tv.bind("<Double-1>", lambda e: self._load_selected_into_form("instructors"))
-        self.courses_tab = ttk.Frame(nb)
-        nb.add(self.courses_tab, text="Courses")
-        self.courses_tab.rowconfigure(0, weight=1)
-        self.courses_tab.columnconfigure(0, weight=1)
-        self.courses_tv = ttk.Treeview(
-            self.courses_tab,
-            columns=("id","name","instructor","students"),
-            show="headings",
-            selectmode="browse"
-        )
-        for col, txt, w in [
-            ("id","Course ID",120),("name","Course Name",220),
-            ("instructor","Instructor",200),("students","Enrolled Students",420)
-        ]:
-            self.courses_tv.heading(col, text=txt)
-            self.courses_tv.column(col, width=w, anchor="w")
-
-        crs_y = ttk.Scrollbar(self.courses_tab, orient="vertical", command=self.courses_tv.yview)
-        crs_x = ttk.Scrollbar(self.courses_tab, orient="horizontal", command=self.courses_tv.xview)
-        self.courses_tv.configure(yscrollcommand=crs_y.set, xscrollcommand=crs_x.set)
-        self.courses_tv.grid(row=0, column=0, sticky="nsew", padx=(5,0), pady=(5,0))
-        crs_y.grid(row=0, column=1, sticky="ns", padx=(0,5), pady=(5,0))
-        crs_x.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=(0,5))
-        self.courses_tv.bind("<Double-1>", lambda e: self._load_selected_into_form("courses"))
+        # (treeview, kind) per tab widget name; Edit/Delete act on the visible tab
+        self._tab_views = {}
+        self._tv_by_kind = {}
+        self.students_tab, self.students_tv = self._make_tab(nb, "Students", "students", self.STUDENT_COLUMNS)
+        self.instructors_tab, self.instructors_tv = self._make_tab(nb, "Instructors", "instructors", self.INSTRUCTOR_COLUMNS)
+        self.courses_tab, self.courses_tv = self._make_tab(nb, "Courses", "courses", self.COURSE_COLUMNS)
+        self._cur_tv, self._cur_kind = self.students_tv, "students"
+        nb.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         ctl = ttk.Frame(self)
         ctl.pack(fill="x", padx=10, pady=5)
         ttk.Button(ctl, text="Edit Selected", command=self._edit_selected).pack(side="left")
         ttk.Button(ctl, text="Delete Selected", command=self._delete_selected).pack(side="left", padx=8)
 
+    def _make_tab(self, nb, text, kind, spec):
+        """
+        Adds a notebook tab holding a scrollable table.
+        
+        Args:
+            nb (ttk.Notebook): The notebook to add the tab to
+            text (str): Tab title
+            kind (str): "students", "instructors", or "courses"; double-clicking
+                a row loads it into that form
+            spec (tuple): (column, heading, width) for each column
+        
+        Returns:
+            tuple: (tab frame, ttk.Treeview)
+        """
+        tab = ttk.Frame(nb)
+        nb.add(tab, text=text)
+        tab.rowconfigure(0, weight=1)
+        tab.columnconfigure(0, weight=1)
+        tv = ttk.Treeview(tab, columns=tuple(c[0] for c in spec), show="headings", selectmode="browse")
+        # One raw Tcl call per heading and per column instead of Treeview's option wrappers
+        call, w = tv.tk.call, tv._w
+        for col, txt, width in spec:
+            call(w, "heading", col, "-text", txt)
+            call(w, "column", col, "-width", width, "-anchor", "w")
+        y = ttk.Scrollbar(tab, orient="vertical", command=tv.yview)
+        x = ttk.Scrollbar(tab, orient="horizontal", command=tv.xview)
+        tv.configure(yscrollcommand=y.set, xscrollcommand=x.set)
+        tv.grid(row=0, column=0, sticky="nsew", padx=(5,0), pady=(5,0))
+        y.grid(row=0, column=1, sticky="ns", padx=(0,5), pady=(5,0))
+        x.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=(0,5))
+        tv.bind("<Double-1>", functools.partial(self._load_selected_into_form, kind))
+        self._tab_views[str(tab)] = (tv, kind)
+        self._tv_by_kind[kind] = tv
+        return tab, tv
+
+    def _on_tab_changed(self, event):
+        """
+        Remembers the treeview and kind of the newly selected notebook tab.
+        
+        Args:
+            event: The <<NotebookTabChanged>> event
+        """
+        self._cur_tv, self._cur_kind = self._tab_views[str(event.widget.select())]
+
     def _build_search(self):
         """
         Creates the search interface for filtering displayed records.
@@ -342,6 +361,10 @@ class SchoolApp(tk.Tk):
         # Search action buttons
         ttk.Button(bar, text="Search", command=self._apply_search).pack(side="left", padx=6)
         ttk.Button(bar, text="Clear", command=self._clear_search).pack(side="left", padx=6)
+        
+        # Search as you type, once typing pauses for 150 ms
+        self._search_job = None
+        self.search_var.trace_add("write", self._schedule_search)
 
     def _add_or_update_student(self):
         """
@@ -364,20 +387,16 @@ class SchoolApp(tk.Tk):
             if self.edit_mode["students"] is None:
                 self.db.create_student(sid, name, age, email)
             else:
-                # Update existing student
+                # Update existing student; an ID change is renamed in place so registrations follow
                 sid_key = self.edit_mode["students"]
-                self.db.update_student(sid_key, name, age, email)
-                # Handle ID changes by creating new record if needed
-                if sid != sid_key:                    
-                    try:
-                        self.db.delete_student(sid)
-                    except sqlite3.IntegrityError:
-                        pass
-                    self.db.create_student(sid, name, age, email)
+                if sid != sid_key:
+                    self.db.rename_student(sid_key, sid, name, age, email)
+                else:
+                    self.db.update_student(sid_key, name, age, email)
             
             # Reset form and refresh displays
             self._clear_form("students")
-            self._refresh_all_views(); self._refresh_dropdowns()
+            self._refresh_all_views()
         except sqlite3.IntegrityError as e:
             messagebox.showerror("Error", f"DB constraint failed: {e}")
         except Exception as e:
@@ -394,15 +413,12 @@ class SchoolApp(tk.Tk):
                 self.db.create_instructor(iid, name, age, email)
             else:
                 iid_key = self.edit_mode["instructors"]
-                self.db.update_instructor(iid_key, name, age, email)
                 if iid != iid_key:
-                    try:
-                        self.db.delete_instructor(iid)
-                    except sqlite3.IntegrityError:
-                        pass
-                    self.db.create_instructor(iid, name, age, email)
+                    self.db.rename_instructor(iid_key, iid, name, age, email)
+                else:
+                    self.db.update_instructor(iid_key, name, age, email)
             self._clear_form("instructors")
-            self._refresh_all_views(); self._refresh_dropdowns()
+            self._refresh_all_views()
         except sqlite3.IntegrityError as e:
             messagebox.showerror("Error", f"DB constraint failed: {e}")
         except Exception as e:
@@ -416,20 +432,17 @@ class SchoolApp(tk.Tk):
             validate_nonempty_str(cid,"course_id"); validate_nonempty_str(cname,"course_name")
             if not ins_label:
                 raise ValueError("Please select an instructor")
-            ins_id = ins_label.split(" | ")[0]
+            ins_id = ins_label.partition(" | ")[0]
             if self.edit_mode["courses"] is None:
                 self.db.create_course(cid, cname, ins_id)
             else:
                 cid_key = self.edit_mode["courses"]
-                self.db.update_course(cid_key, course_name=cname, instructor_id=ins_id)
                 if cid != cid_key:
-                    try:
-                        self.db.delete_course(cid)
-                    except sqlite3.IntegrityError:
-                        pass
-                    self.db.create_course(cid, cname, ins_id)
+                    self.db.rename_course(cid_key, cid, cname, ins_id)
+                else:
+                    self.db.update_course(cid_key, course_name=cname, instructor_id=ins_id)
             self._clear_form("courses")
-            self._refresh_all_views(); self._refresh_dropdowns()
+            self._refresh_all_views()
         except sqlite3.IntegrityError as e:
             messagebox.showerror("Error", f"DB constraint failed: {e}")
         except Exception as e:
@@ -441,8 +454,8 @@ class SchoolApp(tk.Tk):
             c_label = self.reg_course_cb.get().strip()
             if not s_label or not c_label:
                 raise ValueError("Select a student and a course")
-            sid = s_label.split(" | ")[0]
-            cid = c_label.split(" | ")[0]
+            sid = s_label.partition(" | ")[0]
+            cid = c_label.partition(" | ")[0]
             self.db.register_student(sid, cid)
             self._refresh_all_views()
         except sqlite3.IntegrityError as e:
@@ -456,78 +469,226 @@ class SchoolApp(tk.Tk):
             c_label = self.asg_course_cb.get().strip()
             if not i_label or not c_label:
                 raise ValueError("Select an instructor and a course")
-            iid = i_label.split(" | ")[0]
-            cid = c_label.split(" | ")[0]
+            iid = i_label.partition(" | ")[0]
+            cid = c_label.partition(" | ")[0]
             self.db.update_course(cid, instructor_id=iid)  
-            self._refresh_all_views(); self._refresh_dropdowns()
+            self._refresh_all_views()
         except sqlite3.IntegrityError as e:
             messagebox.showerror("Error", f"DB constraint failed: {e}")
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
-    def _refresh_all_views(self, filtered_query: str = ""):
+    def _refresh_all_views(self, filtered_query: str = "", force: bool = False):
         """
         Updates all data display tables with current database information.
         
         Args:
             filtered_query (str): Optional search query to filter displayed records
+            force (bool): Refresh even if nothing was written since the last refresh
+        
+        The queries run on the refresh worker thread, so this returns at once;
+        the tables and dropdowns are updated by _apply_snapshot when the rows
+        arrive. Earlier refreshes still in flight are discarded. Without a query,
+        nothing happens if this connection has written no rows since the last
+        refresh (e.g. a duplicate registration that INSERT OR IGNORE skipped).
+        """
+        changes = self.db.conn.total_changes
+        if not force and not filtered_query and changes == self._last_changes:
+            return
+        self._last_changes = changes
+        self._refresh_gen += 1
+        self._refresh_requests.put((self._refresh_gen, filtered_query))
+        if not self._refresh_polling:
+            self._refresh_polling = True
+            self.after(10, self._poll_refresh)
+
+    def _refresh_worker(self):
+        """
+        Worker thread: reads the three joined tables for each refresh request.
+        
+        Uses its own read-only DB connection (sqlite3 connections stay on the
+        thread that opened them), which under WAL reads alongside the writer. A burst of requests is answered once,
+        for the newest one, and the previous rows are reused as long as
+        PRAGMA data_version shows no commit from another connection since.
+        """
+        db, last_dv, payload = None, None, None
+        while True:
+            gen, q = self._refresh_requests.get()
+            try:
+                while True:
+                    gen, q = self._refresh_requests.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                # Opened here so a failure is reported like any other read error (and retried
+                # on the next refresh) instead of killing the thread and leaving the poll running
+                if db is None:
+                    db = DB(self.db.path, readonly=True)
+                dv = db.conn.execute("PRAGMA data_version").fetchone()[0]
+                if dv != last_dv or not isinstance(payload, tuple):
+                    payload = self._read_snapshot(db)
+                    last_dv = dv
+            except Exception as e:
+                payload = e
+            self._refresh_results.put((gen, q, payload))
+
+    def _read_snapshot(self, db):
+        """
+        Streams the three joined tables into display rows; runs on the worker thread.
+        
+        Each table is one query with the related ids already joined in SQL, and rows
+        are shaped as they arrive instead of after a full fetchall().
+        
+        Args:
+            db (DB): The worker's read-only connection
+        
+        Returns:
+            tuple: (snapshot, student labels, instructor labels, course labels, instructors by id)
+        """
+        # Rows are kept as (item id, values, search key) so searches can refilter without the DB;
+        # the key is the ID, name, and course/student list lowercased once, joined by \x1f
+        students, student_labels = [], []
+        for s in db.iter_students_with_courses():
+            sid, name, courses = s["student_id"], s["name"], s["courses"]
+            students.append((f"stu:{sid}", (sid, name, s["age"], s["email"], courses),
+                             f"{sid}\x1f{name}\x1f{courses}".lower()))
+            student_labels.append(f"{sid} | {name}")
+        instructors, instructor_labels, instructor_by_id = [], [], {}
+        for ins in db.iter_instructors_with_courses():
+            iid, name, courses = ins["instructor_id"], ins["name"], ins["courses"]
+            instructors.append((f"ins:{iid}", (iid, name, ins["age"], ins["email"], courses),
+                                f"{iid}\x1f{name}\x1f{courses}".lower()))
+            instructor_labels.append(f"{iid} | {name}")
+            instructor_by_id[iid] = ins
+        courses, course_labels = [], []
+        for c in db.iter_courses_with_students():
+            cid, cname, students_col = c["course_id"], c["course_name"], c["students"]
+            courses.append((f"crs:{cid}", (cid, cname,
+                                           f"{(c['instructor_id'] or '').strip()} - {(c['instructor_name'] or '').strip()}",
+                                           students_col),
+                            f"{cid}\x1f{cname}\x1f{students_col}".lower()))
+            course_labels.append(f"{cid} | {cname}")
+        return (students, instructors, courses), student_labels, instructor_labels, course_labels, instructor_by_id
+
+    def _poll_refresh(self):
+        """
+        Applies finished refreshes on the Tk thread; re-arms itself until the
+        newest requested refresh has been shown.
+        """
+        try:
+            while True:
+                gen, q, payload = self._refresh_results.get_nowait()
+                if gen != self._refresh_gen:
+                    continue
+                self._refresh_polling = False
+                if isinstance(payload, Exception):
+                    messagebox.showerror("Error", str(payload))
+                else:
+                    self._apply_snapshot(payload, q)
+                return
+        except queue.Empty:
+            self.after(10, self._poll_refresh)
+
+    def _apply_snapshot(self, payload, filtered_query: str = ""):
+        """
+        Caches a freshly read snapshot and redraws the tables and dropdowns from it.
+        
+        Args:
+            payload (tuple): What _read_snapshot returned
+            filtered_query (str): Optional search query to filter displayed records
+        """
+        # Dropdown labels come from the same rows, so _refresh_dropdowns needs no queries
+        (self._last_snapshot, self._student_labels, self._instructor_labels,
+         self._course_labels, self._instructor_by_id) = payload
+        self._repopulate_from_cache(filtered_query)
+        self._refresh_dropdowns()
+
+    def _repopulate_from_cache(self, filtered_query: str = ""):
+        """
+        Refills the three tables from the rows cached by the last refresh.
         
-        Refreshes the student, instructor, and course tables with the latest
-        data from the database, applying any search filters if provided.
+        Args:
+            filtered_query (str): Optional search query; a row is shown if its ID,
+                name, or course/student list contains it (case-insensitive)
         """
-        # Convert search query to lowercase for case-insensitive matching
         q = filtered_query.lower().strip()
+        for tv, rows in zip((self.students_tv, self.instructors_tv, self.courses_tv), self._last_snapshot):
+            if q:
+                rows = ((iid, values) for iid, values, key in rows if q in key)
+            else:
+                rows = ((iid, values) for iid, values, _ in rows)
+            self._fill_tv(tv, rows)
+
+    def _fill_tv(self, tv, rows):
+        """
+        Replaces every row of a treeview.
         
-        # Refresh students table
-        self.students_tv.delete(*self.students_tv.get_children())
-        for s in self.db.list_students():
-            courses_str = ", ".join(self.db.list_student_courses(s["student_id"]))
-            row = (s["student_id"], s["name"], s["age"], s["email"], courses_str)
-            # Show row if no filter or if filter matches ID, name, or courses
-            if not q or q in s["student_id"].lower() or q in s["name"].lower() or q in courses_str.lower():
-                self.students_tv.insert("", "end", iid=f"stu:{s['student_id']}", values=row)
-        
-        # Refresh instructors table
-        self.instructors_tv.delete(*self.instructors_tv.get_children())
-        ins_list = self.db.list_instructors()
-        for ins in ins_list:
-            rows = self.db.conn.execute(
-                "SELECT course_id FROM courses WHERE instructor_id=? ORDER BY course_id",
-                (ins["instructor_id"],)
-            ).fetchall()
-            courses_str = ", ".join([r["course_id"] for r in rows])
-            row = (ins["instructor_id"], ins["name"], ins["age"], ins["email"], courses_str)
-            # Show row if no filter or if filter matches ID, name, or courses
-            if not q or q in ins["instructor_id"].lower() or q in ins["name"].lower() or q in courses_str.lower():
-                self.instructors_tv.insert("", "end", iid=f"ins:{ins['instructor_id']}", values=row)
-        
-        # Refresh courses table
-        self.courses_tv.delete(*self.courses_tv.get_children())
-        for c in self.db.list_courses():
-            students_str = ", ".join(self.db.list_course_students(c["course_id"]))
-            instr_label = f"{(c['instructor_id'] or '').strip()} - {(c.get('instructor_name') or '').strip()}"
-            row = (c["course_id"], c["course_name"], instr_label, students_str)
-            # Show row if no filter or if filter matches ID, name, or students
-            if not q or q in c["course_id"].lower() or q in c["course_name"].lower() or q in students_str.lower():
-                self.courses_tv.insert("", "end", iid=f"crs:{c['course_id']}", values=row)
+        Args:
+            tv (ttk.Treeview): The treeview to refill
+            rows (iterable): (item id, values) pairs in display order
+        
+        Only the first FILL_CHUNK rows are inserted right away, which covers the
+        visible part of the table; the rest follow in chunks from after_idle so
+        the window stays responsive. Refilling the same treeview cancels any
+        chunks still pending from the previous fill.
+        """
+        job = self._fill_jobs.pop(tv, None)
+        if job is not None:
+            self.after_cancel(job)
+        children = tv.get_children()
+        if children:
+            tv.delete(*children)
+        self._fill_chunk(tv, iter(rows))
+
+    FILL_CHUNK = 500
+
+    def _fill_chunk(self, tv, rows):
+        """
+        Inserts the next FILL_CHUNK rows and schedules the chunk after it.
+        
+        Args:
+            tv (ttk.Treeview): The treeview being filled
+            rows (iterator): Remaining (item id, values) pairs
+        
+        Rows go straight to the Tcl insert command; ttk.Treeview.insert would
+        re-format its keyword options in Python for every row.
+        """
+        call, w = tv.tk.call, tv._w
+        n = 0
+        for iid, values in itertools.islice(rows, self.FILL_CHUNK):
+            call(w, "insert", "", "end", "-id", iid, "-values", values)
+            n += 1
+        if n == self.FILL_CHUNK:
+            self._fill_jobs[tv] = self.after_idle(self._fill_chunk, tv, rows)
+        else:
+            self._fill_jobs.pop(tv, None)
+
+    def _schedule_search(self, *_):
+        """
+        Restarts the 150 ms search timer; called on every change to the query.
+        """
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(150, self._apply_search)
 
     def _apply_search(self):
         """
         Applies the current search query to filter displayed records.
         """
-        self._refresh_all_views(self.search_var.get())
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
+        self._repopulate_from_cache(self.search_var.get())
 
     def _clear_search(self):
         """
         Clears the search query and shows all records.
         """
         self.search_var.set("")
-        self._refresh_all_views()
+        self._apply_search()
 
     def _edit_selected(self):
-        tv, kind = self._current_tv_and_kind()
-        if not tv:
-            return
+        tv, kind = self._cur_tv, self._cur_kind
         sel = tv.selection()
         if not sel:
             messagebox.showinfo("Info", "Select a row to edit.")
@@ -535,9 +696,7 @@ class SchoolApp(tk.Tk):
         self._load_selected_into_form(kind)
 
     def _delete_selected(self):
-        tv, kind = self._current_tv_and_kind()
-        if not tv:
-            return
+        tv, kind = self._cur_tv, self._cur_kind
         sel = tv.selection()
         if not sel:
             messagebox.showinfo("Info", "Select a row to delete.")
@@ -545,25 +704,24 @@ class SchoolApp(tk.Tk):
         iid = sel[0]
         try:
             if kind == "students":
-                sid = iid.split("stu:")[1]
+                sid = iid.partition("stu:")[2]
                 self.db.delete_student(sid)
             elif kind == "instructors":
-                insid = iid.split("ins:")[1]
+                insid = iid.partition("ins:")[2]
                 self.db.delete_instructor(insid) 
                 messagebox.showwarning("Warning", "Deleted instructor. Courses taught by them should be reassigned.")
             elif kind == "courses":
-                cid = iid.split("crs:")[1]
+                cid = iid.partition("crs:")[2]
                 self.db.delete_course(cid)
             self._refresh_all_views()
-            self._refresh_dropdowns()
             self._clear_form(kind)
         except sqlite3.IntegrityError as e:
             messagebox.showerror("Error", f"DB constraint failed: {e}")
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
-    def _load_selected_into_form(self, kind):
-        tv = {"students": self.students_tv, "instructors": self.instructors_tv, "courses": self.courses_tv}[kind]
+    def _load_selected_into_form(self, kind, event=None):
+        tv = self._tv_by_kind[kind]
         sel = tv.selection()
         if not sel:
             return
@@ -588,15 +746,10 @@ class SchoolApp(tk.Tk):
             cid, cname, instr_label = row[0], row[1], row[2]
             self.c_id.delete(0, tk.END); self.c_id.insert(0, cid)
             self.c_name.delete(0, tk.END); self.c_name.insert(0, cname)
-            try:
-                iid = instr_label.split(" - ")[0].strip()
-                if iid:
-                    for i in self.db.list_instructors():
-                        if i["instructor_id"] == iid:
-                            self.c_instructor.set(f"{iid} | {i['name']}")
-                            break
-            except:
-                pass
+            iid = instr_label.partition(" - ")[0].strip()
+            i = self._instructor_by_id.get(iid)
+            if i:
+                self.c_instructor.set(f"{iid} | {i['name']}")
             self.edit_mode["courses"] = cid
             self.c_add_btn.config(text="Update Course")
 
@@ -615,116 +768,95 @@ class SchoolApp(tk.Tk):
             self.edit_mode["courses"] = None
             self.c_add_btn.config(text="Add Course")
 
-    def _snapshot(self):
-        students = self.db.list_students()
-        instructors = self.db.list_instructors()
-        courses = self.db.list_courses()
-        regs = [dict(r) for r in self.db.conn.execute("SELECT student_id, course_id FROM registrations ORDER BY student_id, course_id")]
-        return {"students": students, "instructors": instructors, "courses": courses, "registrations": regs}
+    def _io_conn(self):
+        """
+        Returns the I/O thread's DB, opening it on first use.
+        
+        Only called from jobs on self._io_exec, whose single thread owns the
+        connection.
+        """
+        if self._io_db is None:
+            self._io_db = DB(self.db.path)
+        return self._io_db
 
-    def _clear_all_tables(self):
-        self.db.conn.execute("DELETE FROM registrations")
-        self.db.conn.execute("DELETE FROM courses")
-        self.db.conn.execute("DELETE FROM students")
-        self.db.conn.execute("DELETE FROM instructors")
-        self.db.conn.commit()
+    def _run_io(self, job, on_done):
+        """
+        Runs job on the I/O thread and calls on_done on the Tk thread when it finishes.
+        
+        Args:
+            job (callable): Work to run off the Tk thread; must not touch widgets
+            on_done (callable): Called with no arguments if job succeeded
+        """
+        fut = self._io_exec.submit(job)
+        self.after(50, self._poll_io, fut, on_done)
 
-    def _save_to_file(self):
-        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON","*.json")])
-        if not path: return
+    def _poll_io(self, fut, on_done):
+        """
+        Waits for an I/O job without blocking the event loop, then reports the outcome.
+        """
+        if not fut.done():
+            self.after(50, self._poll_io, fut, on_done)
+            return
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(self._snapshot(), f, indent=2)
-            messagebox.showinfo("Saved", f"Saved to {path}")
+            fut.result()
         except Exception as e:
             messagebox.showerror("Error", str(e))
+            return
+        on_done()
+
+    def _save_to_file(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON","*.json")])
+        if not path: return
+        def job():
+            with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                self._io_conn().write_snapshot(f)
+        self._run_io(job, lambda: messagebox.showinfo("Saved", f"Saved to {path}"))
 
     def _load_from_file(self):
         path = filedialog.askopenfilename(filetypes=[("JSON","*.json")])
         if not path: return
-        try:
+        def job():
             with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
-
-            self._clear_all_tables()
-
-            for i in data.get("instructors", []):
-                self.db.create_instructor(i["instructor_id"], i["name"], int(i["age"]), i["email"])
-            for s in data.get("students", []):
-                self.db.create_student(s["student_id"], s["name"], int(s["age"]), s["email"])
-            for c in data.get("courses", []):
-                self.db.create_course(c["course_id"], c["course_name"], c.get("instructor_id"))
-            for r in data.get("registrations", []):
-                self.db.register_student(r["student_id"], r["course_id"])
-
-            self._refresh_all_views()
-            self._refresh_dropdowns()
+            self._io_conn().bulk_load(data)
+        def done():
+            # The load committed on the I/O connection, so self.db saw no writes of its own
+            self._refresh_all_views(force=True)
             messagebox.showinfo("Loaded", f"Loaded from {path}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self._run_io(job, done)
 
     def _export_csv(self):
         folder = filedialog.askdirectory()
         if not folder: return
-        try:
-            with open(f"{folder}/students.csv", "w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f); w.writerow(["student_id","name","age","email","registered_courses"])
-                for s in self.db.list_students():
-                    courses = " ".join(self.db.list_student_courses(s["student_id"]))
-                    w.writerow([s["student_id"], s["name"], s["age"], s["email"], courses])
-
-            with open(f"{folder}/instructors.csv", "w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f); w.writerow(["instructor_id","name","age","email","assigned_courses"])
-                for ins in self.db.list_instructors():
-                    rows = self.db.conn.execute(
-                        "SELECT course_id FROM courses WHERE instructor_id=? ORDER BY course_id",
-                        (ins["instructor_id"],)
-                    ).fetchall()
-                    courses = " ".join([r["course_id"] for r in rows])
-                    w.writerow([ins["instructor_id"], ins["name"], ins["age"], ins["email"], courses])
-
-            with open(f"{folder}/courses.csv", "w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f); w.writerow(["course_id","course_name","instructor_id","instructor_name","enrolled_students"])
-                for c in self.db.list_courses():
-                    students = " ".join(self.db.list_course_students(c["course_id"]))
-                    w.writerow([c["course_id"], c["course_name"], c["instructor_id"] or "", c.get("instructor_name") or "", students])
-            messagebox.showinfo("Exported", f"CSV files saved in {folder}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        def job():
+            # One joined query per file, streamed into the writer; all three read inside one transaction
+            db = self._io_conn()
+            with db.transaction():
+                for name, header in DB.EXPORT_HEADERS.items():
+                    with open(os.path.join(folder, f"{name}.csv"), "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+                        w = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+                        w.writerow(header)
+                        w.writerows(db.iter_export_rows(name))
+        self._run_io(job, lambda: messagebox.showinfo("Exported", f"CSV files saved in {folder}"))
 
     def _refresh_dropdowns(self):
         """
         Updates all dropdown menus with current database information.
         
         Refreshes the combobox values for course instructor selection,
-        student registration, and instructor assignment dropdowns.
+        student registration, and instructor assignment dropdowns from the
+        labels cached by the last _apply_snapshot call.
         """
         # Update course form instructor dropdown
-        self.c_instructor["values"] = [f"{i['instructor_id']} | {i['name']}" for i in self.db.list_instructors()]
+        self.c_instructor["values"] = self._instructor_labels
         
         # Update registration dropdowns
-        self.reg_student_cb["values"] = [f"{s['student_id']} | {s['name']}" for s in self.db.list_students()]
-        self.reg_course_cb["values"] = [f"{c['course_id']} | {c['course_name']}" for c in self.db.list_courses()]
+        self.reg_student_cb["values"] = self._student_labels
+        self.reg_course_cb["values"] = self._course_labels
         
         # Update assignment dropdowns
-        self.asg_instructor_cb["values"] = [f"{i['instructor_id']} | {i['name']}" for i in self.db.list_instructors()]
-        self.asg_course_cb["values"] = [f"{c['course_id']} | {c['course_name']}" for c in self.db.list_courses()]
-
-    def _current_tv_and_kind(self):
-        """
-        Determines which table view is currently active and its type.
-        
-        Returns:
-            tuple: (TreeView widget, string type) or (None, None) if none active
-        """
-        focus_widget = self.focus_get()
-        for tv, kind in [(self.students_tv,"students"), (self.instructors_tv,"instructors"), (self.courses_tv,"courses")]:
-            if focus_widget is tv or tv.focus():
-                return tv, kind
-        if self.students_tv.selection(): return self.students_tv, "students"
-        if self.instructors_tv.selection(): return self.instructors_tv, "instructors"
-        if self.courses_tv.selection(): return self.courses_tv, "courses"
-        return None, None
+        self.asg_instructor_cb["values"] = self._instructor_labels
+        self.asg_course_cb["values"] = self._course_labels
 
 if __name__ == "__main__":
     # Create and run the School Management System application
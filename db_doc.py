@@ -1,14 +1,11 @@
 import sqlite3
-from typing import List, Optional, Dict, Any
+import json
+import pathlib
+from contextlib import contextmanager
+from typing import List, Optional, Dict, Any, Iterator
 
 def create_schema(db_path="school.sqlite"):
-    """this function is about create_schema
-
-:param args: depends on usage
-:type args: varies
-:return: result of create_schema
-:rtype: varies
-"""
+    """Create the tables and indexes if they do not exist, then refresh planner statistics."""
     conn = sqlite3.connect(db_path)
     cur = conn.cursor()
     cur.execute("PRAGMA foreign_keys = ON;")
@@ -48,190 +45,250 @@ def create_schema(db_path="school.sqlite"):
             ON UPDATE CASCADE ON DELETE CASCADE
     )
     """)
+    # Covering indexes for the reverse lookups (course -> students, instructor -> courses);
+    # student -> courses already uses the registrations primary key
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_reg_cid ON registrations(course_id, student_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_courses_iid ON courses(instructor_id, course_id)")
     conn.commit()
+    cur.execute("ANALYZE")
     conn.close()
 
 def backup_database(src_path: str = "school.sqlite", dest_path: str = "backup.sqlite") -> None:
-    """this function is about backup_database
-
-:param args: depends on usage
-:type args: varies
-:return: result of backup_database
-:rtype: varies
-"""
     """Backup the SQLite database to another file."""
+    # Copy 1024 pages per step and sleep briefly between steps, so writers on other
+    # connections can take the lock in between instead of waiting for the whole copy
     with sqlite3.connect(src_path) as src, sqlite3.connect(dest_path) as dst:
-        src.backup(dst)
+        src.backup(dst, pages=1024, sleep=0.001)
     print(f"Database backed up from {src_path} to {dest_path}")
 
+# AS MATERIALIZED needs SQLite 3.35+; older libraries get a plain CTE, which may be inlined
+_MATERIALIZED = "MATERIALIZED " if sqlite3.sqlite_version_info >= (3, 35) else ""
+
+def _py_lower(value):
+    """Lowercase a text value the way str.lower does (SQLite's lower() folds ASCII only)."""
+    return value.lower() if isinstance(value, str) else value
+
 class DB:
-    """this is the class i made for DB:
-
-    :param args: init args if any
-    :type args: varies
-    """
-    def __init__(self, path: str = "school.sqlite"):
-        """this function is about __init__
-
-:param args: depends on usage
-:type args: varies
-:return: result of __init__
-:rtype: varies
-"""
+    """Data access for the school database: students, instructors, courses and registrations."""
+    # Row inserts, shared by the create_* methods and the snapshot loaders' executemany
+    # calls so every caller hits the same cached prepared statement
+    INSERT_STUDENT = "INSERT INTO students(student_id,name,age,email) VALUES(?,?,?,?)"
+    INSERT_INSTRUCTOR = "INSERT INTO instructors(instructor_id,name,age,email) VALUES(?,?,?,?)"
+    INSERT_COURSE = "INSERT INTO courses(course_id,course_name,instructor_id) VALUES(?,?,?)"
+    INSERT_REGISTRATION = "INSERT OR IGNORE INTO registrations(student_id, course_id) VALUES(?,?)"
+
+    # Each row carries its related ids joined with :sep, ordered by id.
+    # search_* wrap these in a MATERIALIZED CTE so the joined list is built once per row,
+    # not again for the search filter.
+    STUDENTS_WITH_COURSES = """
+        SELECT s.student_id, s.name, s.age, s.email,
+               COALESCE((SELECT GROUP_CONCAT(course_id, :sep) FROM
+                           (SELECT course_id FROM registrations
+                            WHERE student_id = s.student_id ORDER BY course_id)), '') AS courses
+        FROM students s"""
+    INSTRUCTORS_WITH_COURSES = """
+        SELECT i.instructor_id, i.name, i.age, i.email,
+               COALESCE((SELECT GROUP_CONCAT(course_id, :sep) FROM
+                           (SELECT course_id FROM courses
+                            WHERE instructor_id = i.instructor_id ORDER BY course_id)), '') AS courses
+        FROM instructors i"""
+    COURSES_WITH_STUDENTS = """
+        SELECT c.course_id, c.course_name, c.instructor_id, i.name AS instructor_name,
+               COALESCE((SELECT GROUP_CONCAT(student_id, :sep) FROM
+                           (SELECT student_id FROM registrations
+                            WHERE course_id = c.course_id ORDER BY student_id)), '') AS students
+        FROM courses c
+        LEFT JOIN instructors i ON i.instructor_id = c.instructor_id"""
+
+    # CSV export: header row and query for each file, named by kind
+    EXPORT_HEADERS = {
+        "students": ("student_id", "name", "age", "email", "registered_courses"),
+        "instructors": ("instructor_id", "name", "age", "email", "assigned_courses"),
+        "courses": ("course_id", "course_name", "instructor_id", "instructor_name", "enrolled_students"),
+    }
+    _EXPORT_SQL = {
+        "students": STUDENTS_WITH_COURSES + " ORDER BY student_id",
+        "instructors": INSTRUCTORS_WITH_COURSES + " ORDER BY instructor_id",
+        "courses": COURSES_WITH_STUDENTS + " ORDER BY course_id",
+    }
+
+    # (section, JSON keys, query) for each part of a snapshot written by write_snapshot
+    SNAPSHOT_SECTIONS = (
+        ("students", ("student_id", "name", "age", "email"),
+         "SELECT student_id, name, age, email FROM students ORDER BY student_id"),
+        ("instructors", ("instructor_id", "name", "age", "email"),
+         "SELECT instructor_id, name, age, email FROM instructors ORDER BY instructor_id"),
+        ("courses", ("course_id", "course_name", "instructor_id", "instructor_name"),
+         """SELECT c.course_id, c.course_name, c.instructor_id, i.name
+            FROM courses c LEFT JOIN instructors i ON i.instructor_id = c.instructor_id
+            ORDER BY c.course_id"""),
+        ("registrations", ("student_id", "course_id"),
+         "SELECT student_id, course_id FROM registrations ORDER BY student_id, course_id"),
+    )
+
+    def __init__(self, path: str = "school.sqlite", readonly: bool = False):
+        """Open the database; readonly=True opens a mode=ro reader for another thread."""
         self.path = path
-        self.conn = sqlite3.connect(self.path)
+        self.readonly = readonly
+        # Keep up to 256 prepared statements instead of the default 128.
+        # Autocommit: a lone statement commits by itself; batches go through transaction().
+        # A readonly DB (mode=ro) is a reader for another thread: under WAL it never waits
+        # on the writer connection, and SQLite rejects any write made through it.
+        target = f"{pathlib.Path(path).resolve().as_uri()}?mode=ro" if readonly else path
+        self.conn = sqlite3.connect(target, uri=readonly, cached_statements=256, isolation_level=None)
         self.conn.row_factory = sqlite3.Row
-        self.conn.execute("PRAGMA foreign_keys = ON;")
+        # Unicode-aware lowercase for search_*; deterministic so SQLite may reuse results
+        self.conn.create_function("py_lower", 1, _py_lower, deterministic=True)
+        # WAL + NORMAL sync: one fsync per checkpoint instead of per commit. Writer-only:
+        # a mode=ro reader can't switch the journal mode and never syncs, so it skips these.
+        if not readonly:
+            self.conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+            """)
+        # Temp b-trees (ORDER BY, GROUP_CONCAT subqueries) in RAM, 256 MiB of the file
+        # memory-mapped, and a 64 MiB page cache so the list_* queries stay in memory
+        self.conn.executescript("""
+            PRAGMA foreign_keys=ON;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+        """)
+        # One cursor for every DB method: sqlite3 already reuses the prepared statement for a
+        # repeated SQL string (statement cache), this also skips a cursor allocation per call.
+        # Each method finishes reading its rows before returning, so sharing it is safe.
+        self._cur = self.conn.cursor()
+        # Per-table write counters; list_* results are reused until a table they read changes
+        self._versions = {"students": 0, "instructors": 0, "courses": 0}
+        self._list_cache = {}
+
+    @contextmanager
+    def transaction(self, mode: str = ""):
+        """Run the block in one transaction: COMMIT on success, ROLLBACK on error."""
+        # mode is "", "IMMEDIATE" or "EXCLUSIVE"; the block commits on success, rolls back on error
+        self._cur.execute(f"BEGIN {mode}")
+        try:
+            yield self.conn
+        except BaseException:
+            if self.conn.in_transaction:
+                self._cur.execute("ROLLBACK")
+            # Lists cached inside the block may include rolled-back writes
+            self._bump(*self._versions)
+            raise
+        self._cur.execute("COMMIT")
+
+    def _bump(self, *tables: str) -> None:
+        """Mark tables as written so cached list_* results that read them are rebuilt."""
+        for t in tables:
+            self._versions[t] += 1
+
+    def _cached_list(self, key: str, tables: tuple, sql: str) -> List[sqlite3.Row]:
+        """Return the rows of sql, reusing the last result while its tables are unchanged."""
+        # The returned list is shared between calls; callers must not modify it.
+        # data_version changes when another connection commits, which the counters can't see
+        dv = self._cur.execute("PRAGMA data_version").fetchone()[0]
+        ver = (dv,) + tuple(self._versions[t] for t in tables)
+        hit = self._list_cache.get(key)
+        if hit is not None and hit[0] == ver:
+            return hit[1]
+        # sqlite3.Row already supports row["column"]; no per-row dict copy
+        rows = self._cur.execute(sql).fetchall()
+        self._list_cache[key] = (ver, rows)
+        return rows
 
     def create_student(self, student_id: str, name: str, age: int, email: str) -> None:
-        """this function is about create_student
-
-:param args: depends on usage
-:type args: varies
-:return: result of create_student
-:rtype: varies
-"""
-        self.conn.execute(
-            "INSERT INTO students(student_id,name,age,email) VALUES(?,?,?,?)",
+        """Insert a student row."""
+        self._cur.execute(
+            self.INSERT_STUDENT,
             (student_id, name, age, email),
         )
-        self.conn.commit()
+        self._bump("students")
 
     def get_student(self, student_id: str) -> Optional[Dict[str, Any]]:
-        """this function is about get_student
-
-:param args: depends on usage
-:type args: varies
-:return: result of get_student
-:rtype: varies
-"""
-        row = self.conn.execute(
+        """Return one student as a dict, or None."""
+        row = self._cur.execute(
             "SELECT * FROM students WHERE student_id=?", (student_id,)
         ).fetchone()
         return dict(row) if row else None
 
-    def list_students(self) -> List[Dict[str, Any]]:
-        """this function is about list_students
-
-:param args: depends on usage
-:type args: varies
-:return: result of list_students
-:rtype: varies
-"""
-        rows = self.conn.execute("SELECT * FROM students ORDER BY student_id").fetchall()
-        return [dict(r) for r in rows]
+    def list_students(self) -> List[sqlite3.Row]:
+        """Return all students ordered by id."""
+        return self._cached_list("students", ("students",), "SELECT * FROM students ORDER BY student_id")
 
     def update_student(self, student_id: str, name: str, age: int, email: str) -> None:
-        """this function is about update_student
-
-:param args: depends on usage
-:type args: varies
-:return: result of update_student
-:rtype: varies
-"""
-        self.conn.execute(
+        """Update a student's name, age and email."""
+        self._cur.execute(
             "UPDATE students SET name=?, age=?, email=? WHERE student_id=?",
             (name, age, email, student_id),
         )
-        self.conn.commit()
+        self._bump("students")
+
+    def rename_student(self, old_id: str, new_id: str, name: str, age: int, email: str) -> None:
+        """Change a student's id (and details); registrations follow by cascade."""
+        # One UPDATE; the ON UPDATE CASCADE foreign keys carry the new id into the other tables
+        self._cur.execute(
+            "UPDATE students SET student_id=?, name=?, age=?, email=? WHERE student_id=?",
+            (new_id, name, age, email, old_id),
+        )
+        self._bump("students")
 
     def delete_student(self, student_id: str) -> None:
-        """this function is about delete_student
-
-:param args: depends on usage
-:type args: varies
-:return: result of delete_student
-:rtype: varies
-"""
-        self.conn.execute("DELETE FROM students WHERE student_id=?", (student_id,))
-        self.conn.commit()
+        """Delete a student and, by cascade, their registrations."""
+        self._cur.execute("DELETE FROM students WHERE student_id=?", (student_id,))
+        self._bump("students")
 
     def create_instructor(self, instructor_id: str, name: str, age: int, email: str) -> None:
-        """this function is about create_instructor
-
-:param args: depends on usage
-:type args: varies
-:return: result of create_instructor
-:rtype: varies
-"""
-        self.conn.execute(
-            "INSERT INTO instructors(instructor_id,name,age,email) VALUES(?,?,?,?)",
+        """Insert an instructor row."""
+        self._cur.execute(
+            self.INSERT_INSTRUCTOR,
             (instructor_id, name, age, email),
         )
-        self.conn.commit()
+        self._bump("instructors")
 
     def get_instructor(self, instructor_id: str) -> Optional[Dict[str, Any]]:
-        """this function is about get_instructor
-
-:param args: depends on usage
-:type args: varies
-:return: result of get_instructor
-:rtype: varies
-"""
-        row = self.conn.execute(
+        """Return one instructor as a dict, or None."""
+        row = self._cur.execute(
             "SELECT * FROM instructors WHERE instructor_id=?", (instructor_id,)
         ).fetchone()
         return dict(row) if row else None
 
-    def list_instructors(self) -> List[Dict[str, Any]]:
-        """this function is about list_instructors
-
-:param args: depends on usage
-:type args: varies
-:return: result of list_instructors
-:rtype: varies
-"""
-        rows = self.conn.execute("SELECT * FROM instructors ORDER BY instructor_id").fetchall()
-        return [dict(r) for r in rows]
+    def list_instructors(self) -> List[sqlite3.Row]:
+        """Return all instructors ordered by id."""
+        return self._cached_list("instructors", ("instructors",), "SELECT * FROM instructors ORDER BY instructor_id")
 
     def update_instructor(self, instructor_id: str, name: str, age: int, email: str) -> None:
-        """this function is about update_instructor
-
-:param args: depends on usage
-:type args: varies
-:return: result of update_instructor
-:rtype: varies
-"""
-        self.conn.execute(
+        """Update an instructor's name, age and email."""
+        self._cur.execute(
             "UPDATE instructors SET name=?, age=?, email=? WHERE instructor_id=?",
             (name, age, email, instructor_id),
         )
-        self.conn.commit()
+        self._bump("instructors")
+
+    def rename_instructor(self, old_id: str, new_id: str, name: str, age: int, email: str) -> None:
+        """Change an instructor's id (and details); their courses follow by cascade."""
+        # One UPDATE; the ON UPDATE CASCADE foreign keys carry the new id into the other tables
+        self._cur.execute(
+            "UPDATE instructors SET instructor_id=?, name=?, age=?, email=? WHERE instructor_id=?",
+            (new_id, name, age, email, old_id),
+        )
+        self._bump("instructors")
 
     def delete_instructor(self, instructor_id: str) -> None:
-        """this function is about delete_instructor
-
-:param args: depends on usage
-:type args: varies
-:return: result of delete_instructor
-:rtype: varies
-"""
-        self.conn.execute("DELETE FROM instructors WHERE instructor_id=?", (instructor_id,))
-        self.conn.commit()
+        """Delete an instructor; their courses are left without one."""
+        self._cur.execute("DELETE FROM instructors WHERE instructor_id=?", (instructor_id,))
+        self._bump("instructors")
 
     def create_course(self, course_id: str, course_name: str, instructor_id: Optional[str]) -> None:
-        """this function is about create_course
-
-:param args: depends on usage
-:type args: varies
-:return: result of create_course
-:rtype: varies
-"""
-        self.conn.execute(
-            "INSERT INTO courses(course_id,course_name,instructor_id) VALUES(?,?,?)",
+        """Insert a course row."""
+        self._cur.execute(
+            self.INSERT_COURSE,
             (course_id, course_name, instructor_id),
         )
-        self.conn.commit()
+        self._bump("courses")
 
     def get_course(self, course_id: str) -> Optional[Dict[str, Any]]:
-        """this function is about get_course
-
-:param args: depends on usage
-:type args: varies
-:return: result of get_course
-:rtype: varies
-"""
-        row = self.conn.execute(
+        """Return one course with its instructor's name as a dict, or None."""
+        row = self._cur.execute(
             """SELECT c.course_id, c.course_name, c.instructor_id,
                       i.name AS instructor_name, i.email AS instructor_email
                FROM courses c
@@ -241,125 +298,193 @@ class DB:
         ).fetchone()
         return dict(row) if row else None
 
-    def list_courses(self) -> List[Dict[str, Any]]:
-        """this function is about list_courses
-
-:param args: depends on usage
-:type args: varies
-:return: result of list_courses
-:rtype: varies
-"""
-        rows = self.conn.execute(
+    def list_courses(self) -> List[sqlite3.Row]:
+        """Return all courses with their instructors' names, ordered by id."""
+        # Also depends on instructors: their names are joined in, and renames/deletes cascade
+        return self._cached_list(
+            "courses", ("courses", "instructors"),
             """SELECT c.course_id, c.course_name, c.instructor_id,
                       i.name AS instructor_name
                FROM courses c
                LEFT JOIN instructors i ON i.instructor_id = c.instructor_id
-               ORDER BY c.course_id"""
-        ).fetchall()
-        return [dict(r) for r in rows]
+               ORDER BY c.course_id""",
+        )
 
     def update_course(self, course_id: str, course_name: Optional[str] = None,instructor_id: Optional[str] = None) -> None:
-        """this function is about update_course
-
-        :param args: depends on usage
-        :type args: varies
-        :return: result of update_course
-        :rtype: varies
-        """
+        """Update whichever of course_name and instructor_id is given."""
         if course_name is None and instructor_id is None:
             return
         if course_name is not None and instructor_id is not None:
-            self.conn.execute(
+            self._cur.execute(
                 "UPDATE courses SET course_name=?, instructor_id=? WHERE course_id=?",
                 (course_name, instructor_id, course_id),
             )
         elif course_name is not None:
-            self.conn.execute(
+            self._cur.execute(
                 "UPDATE courses SET course_name=? WHERE course_id=?",
                 (course_name, course_id),
             )
         else:
-            self.conn.execute(
+            self._cur.execute(
                 "UPDATE courses SET instructor_id=? WHERE course_id=?",
                 (instructor_id, course_id),
             )
-        self.conn.commit()
+        self._bump("courses")
+
+    def rename_course(self, old_id: str, new_id: str, course_name: str, instructor_id: Optional[str]) -> None:
+        """Change a course's id (and details); registrations follow by cascade."""
+        # One UPDATE; registrations follow through ON UPDATE CASCADE
+        self._cur.execute(
+            "UPDATE courses SET course_id=?, course_name=?, instructor_id=? WHERE course_id=?",
+            (new_id, course_name, instructor_id, old_id),
+        )
+        self._bump("courses")
 
     def delete_course(self, course_id: str) -> None:
-        """this function is about delete_course
-
-:param args: depends on usage
-:type args: varies
-:return: result of delete_course
-:rtype: varies
-"""
-        self.conn.execute("DELETE FROM courses WHERE course_id=?", (course_id,))
-        self.conn.commit()
+        """Delete a course and, by cascade, its registrations."""
+        self._cur.execute("DELETE FROM courses WHERE course_id=?", (course_id,))
+        self._bump("courses")
 
     def register_student(self, student_id: str, course_id: str) -> None:
-        """this function is about register_student
-
-:param args: depends on usage
-:type args: varies
-:return: result of register_student
-:rtype: varies
-"""
-        self.conn.execute(
-            "INSERT OR IGNORE INTO registrations(student_id, course_id) VALUES(?,?)",
+        """Register a student to a course; registering twice is a no-op."""
+        self._cur.execute(
+            self.INSERT_REGISTRATION,
             (student_id, course_id),
         )
-        self.conn.commit()
 
     def unregister_student(self, student_id: str, course_id: str) -> None:
-        """this function is about unregister_student
-
-:param args: depends on usage
-:type args: varies
-:return: result of unregister_student
-:rtype: varies
-"""
-        self.conn.execute(
+        """Remove a student's registration to a course."""
+        self._cur.execute(
             "DELETE FROM registrations WHERE student_id=? AND course_id=?",
             (student_id, course_id),
         )
-        self.conn.commit()
 
     def list_course_students(self, course_id: str) -> List[str]:
-        """this function is about list_course_students
-
-:param args: depends on usage
-:type args: varies
-:return: result of list_course_students
-:rtype: varies
-"""
-        rows = self.conn.execute(
+        """Return the ids of the students registered to a course."""
+        rows = self._cur.execute(
             "SELECT student_id FROM registrations WHERE course_id=? ORDER BY student_id",
             (course_id,),
         ).fetchall()
         return [r["student_id"] for r in rows]
 
     def list_student_courses(self, student_id: str) -> List[str]:
-        """this function is about list_student_courses
-
-:param args: depends on usage
-:type args: varies
-:return: result of list_student_courses
-:rtype: varies
-"""
-        rows = self.conn.execute(
+        """Return the ids of the courses a student is registered to."""
+        rows = self._cur.execute(
             "SELECT course_id FROM registrations WHERE student_id=? ORDER BY course_id",
             (student_id,),
         ).fetchall()
         return [r["course_id"] for r in rows]
 
-    def close(self) -> None:
-        """this function is about close
+    def list_students_with_courses(self, sep: str = ", ") -> List[sqlite3.Row]:
+        """Return all students, each with its course ids joined by sep."""
+        return self._cur.execute(
+            self.STUDENTS_WITH_COURSES + " ORDER BY student_id", {"sep": sep}
+        ).fetchall()
+
+    def list_instructors_with_courses(self, sep: str = ", ") -> List[sqlite3.Row]:
+        """Return all instructors, each with its course ids joined by sep."""
+        return self._cur.execute(
+            self.INSTRUCTORS_WITH_COURSES + " ORDER BY instructor_id", {"sep": sep}
+        ).fetchall()
+
+    def list_courses_with_students(self, sep: str = ", ") -> List[sqlite3.Row]:
+        """Return all courses, each with its student ids joined by sep."""
+        return self._cur.execute(
+            self.COURSES_WITH_STUDENTS + " ORDER BY course_id", {"sep": sep}
+        ).fetchall()
 
-:param args: depends on usage
-:type args: varies
-:return: result of close
-:rtype: varies
-"""
+    def iter_students_with_courses(self, sep: str = ", ") -> Iterator[sqlite3.Row]:
+        """Yield students with their course ids one row at a time."""
+        # Own cursor, so other DB calls made while the caller iterates don't reset it
+        yield from self.conn.execute(self.STUDENTS_WITH_COURSES + " ORDER BY student_id", {"sep": sep})
+
+    def iter_instructors_with_courses(self, sep: str = ", ") -> Iterator[sqlite3.Row]:
+        """Yield instructors with their course ids one row at a time."""
+        yield from self.conn.execute(self.INSTRUCTORS_WITH_COURSES + " ORDER BY instructor_id", {"sep": sep})
+
+    def iter_courses_with_students(self, sep: str = ", ") -> Iterator[sqlite3.Row]:
+        """Yield courses with their student ids one row at a time."""
+        yield from self.conn.execute(self.COURSES_WITH_STUDENTS + " ORDER BY course_id", {"sep": sep})
+
+    def search_students(self, q: str, sep: str = ", ") -> List[sqlite3.Row]:
+        """Return students whose id, name or course ids contain q (case-insensitive)."""
+        return self._cur.execute(
+            f"""WITH t AS {_MATERIALIZED}({self.STUDENTS_WITH_COURSES})
+                SELECT * FROM t
+                WHERE instr(py_lower(student_id), :q) OR instr(py_lower(name), :q)
+                   OR instr(py_lower(courses), :q)
+                ORDER BY student_id""",
+            {"sep": sep, "q": q.lower()},
+        ).fetchall()
+
+    def search_instructors(self, q: str, sep: str = ", ") -> List[sqlite3.Row]:
+        """Return instructors whose id, name or course ids contain q (case-insensitive)."""
+        return self._cur.execute(
+            f"""WITH t AS {_MATERIALIZED}({self.INSTRUCTORS_WITH_COURSES})
+                SELECT * FROM t
+                WHERE instr(py_lower(instructor_id), :q) OR instr(py_lower(name), :q)
+                   OR instr(py_lower(courses), :q)
+                ORDER BY instructor_id""",
+            {"sep": sep, "q": q.lower()},
+        ).fetchall()
+
+    def search_courses(self, q: str, sep: str = ", ") -> List[sqlite3.Row]:
+        """Return courses whose id, name or student ids contain q (case-insensitive)."""
+        return self._cur.execute(
+            f"""WITH t AS {_MATERIALIZED}({self.COURSES_WITH_STUDENTS})
+                SELECT * FROM t
+                WHERE instr(py_lower(course_id), :q) OR instr(py_lower(course_name), :q)
+                   OR instr(py_lower(students), :q)
+                ORDER BY course_id""",
+            {"sep": sep, "q": q.lower()},
+        ).fetchall()
+
+    def iter_export_rows(self, kind: str, sep: str = " ") -> Iterator[tuple]:
+        """Yield the CSV rows of kind (a key of EXPORT_HEADERS) as plain tuples, ordered by id."""
+        # Own tuple cursor: rows go from SQLite to the csv writer without sqlite3.Row objects
+        cur = self.conn.cursor()
+        cur.row_factory = None
+        yield from cur.execute(self._EXPORT_SQL[kind], {"sep": sep})
+
+    def write_snapshot(self, f) -> None:
+        """Write every table to the text file f as a JSON snapshot that bulk_load reads back."""
+        # Streamed straight from the cursor, one row object per line; all sections are read
+        # in one transaction. Plain tuples: each row is zipped with its keys exactly once
+        cur = self.conn.cursor()
+        cur.row_factory = None
+        with self.transaction():
+            f.write("{")
+            for n, (section, keys, sql) in enumerate(self.SNAPSHOT_SECTIONS):
+                f.write(f'{"," if n else ""}\n  "{section}": [')
+                sep = "\n    "
+                for row in cur.execute(sql):
+                    f.write(sep)
+                    f.write(json.dumps(dict(zip(keys, row))))
+                    sep = ",\n    "
+                f.write("\n  ]")
+            f.write("\n}\n")
+
+    def bulk_load(self, data: Dict[str, Any]) -> None:
+        """Replace all rows with the contents of a JSON snapshot, atomically."""
+        # Build every row first so a malformed snapshot fails before anything is deleted
+        instructors = [(i["instructor_id"], i["name"], int(i["age"]), i["email"]) for i in data.get("instructors", [])]
+        students = [(s["student_id"], s["name"], int(s["age"]), s["email"]) for s in data.get("students", [])]
+        courses = [(c["course_id"], c["course_name"], c.get("instructor_id")) for c in data.get("courses", [])]
+        regs = [(r["student_id"], r["course_id"]) for r in data.get("registrations", [])]
+        # Replace all rows in one transaction; a failed insert rolls back to the old data
+        with self.transaction("IMMEDIATE"):
+            self._cur.execute("DELETE FROM registrations")
+            self._cur.execute("DELETE FROM courses")
+            self._cur.execute("DELETE FROM students")
+            self._cur.execute("DELETE FROM instructors")
+            self._cur.executemany(self.INSERT_INSTRUCTOR, instructors)
+            self._cur.executemany(self.INSERT_STUDENT, students)
+            self._cur.executemany(self.INSERT_COURSE, courses)
+            self._cur.executemany(self.INSERT_REGISTRATION, regs)
+        self._bump("students", "instructors", "courses")
+
+    def close(self) -> None:
+        """Close the connection."""
         self.conn.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules live at the repository root, not in a package. The root goes last on
+# sys.path (python -m pytest puts it first) so the installed PyQt5 package wins
+# over the repo's PyQt5.py app.
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != _ROOT] + [_ROOT]
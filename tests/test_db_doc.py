@@ -0,0 +1,142 @@
+import json
+import sqlite3
+
+import pytest
+
+import db_doc
+from db_doc import DB, create_schema
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "school.sqlite")
+    create_schema(path)
+    db = DB(path)
+    yield db
+    db.close()
+
+
+def test_search_folds_non_ascii_case(db):
+    db.create_student("S1", "Émile", 20, "emile@x.com")
+    db.create_instructor("I1", "Ødegaard", 40, "o@x.com")
+    db.create_course("C1", "Ärztliche Ethik", "I1")
+
+    assert [r["student_id"] for r in db.search_students("émile")] == ["S1"]
+    assert [r["student_id"] for r in db.search_students("ÉMILE")] == ["S1"]
+    assert [r["instructor_id"] for r in db.search_instructors("ødegaard")] == ["I1"]
+    assert [r["course_id"] for r in db.search_courses("ärztliche")] == ["C1"]
+
+
+def test_search_treats_wildcards_literally(db):
+    db.create_student("S1", "Ann", 20, "ann@x.com")
+    db.create_student("S2", "50% Ann_b", 21, "b@x.com")
+
+    assert [r["student_id"] for r in db.search_students("%")] == ["S2"]
+    assert [r["student_id"] for r in db.search_students("_")] == ["S2"]
+
+
+
+def test_search_without_materialized_cte(db, monkeypatch):
+    # What SQLite < 3.35 runs: a plain CTE
+    monkeypatch.setattr(db_doc, "_MATERIALIZED", "")
+    db.create_student("S1", "Ann", 20, "ann@x.com")
+    assert [r["student_id"] for r in db.search_students("ann")] == ["S1"]
+
+def test_readonly_reader_leaves_journal_mode_alone(tmp_path):
+    path = str(tmp_path / "school.sqlite")
+    create_schema(path)
+    reader = DB(path, readonly=True)
+    try:
+        # Opened before any writer: the reader must not have switched the file to WAL
+        assert reader.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        writer = DB(path)
+        writer.create_student("S1", "Ann", 20, "ann@x.com")
+        assert [r["student_id"] for r in reader.list_students_with_courses()] == ["S1"]
+        with pytest.raises(sqlite3.OperationalError):
+            reader.create_student("S2", "Bob", 21, "bob@x.com")
+        writer.close()
+    finally:
+        reader.close()
+
+
+def _populate(db):
+    db.create_instructor("I1", "Alice", 40, "a@x.com")
+    db.create_course("C1", "Math", "I1")
+    db.create_course("C2", "Art", None)
+    db.create_student("S1", "Sam", 20, "s@x.com")
+    db.register_student("S1", "C1")
+
+
+def test_write_snapshot_round_trips_through_bulk_load(db, tmp_path):
+    _populate(db)
+    path = tmp_path / "snap.json"
+    with open(path, "w", encoding="utf-8") as f:
+        db.write_snapshot(f)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["courses"][0] == {"course_id": "C1", "course_name": "Math",
+                                  "instructor_id": "I1", "instructor_name": "Alice"}
+
+    db.create_student("S2", "Bob", 21, "b@x.com")
+    db.bulk_load(data)
+    assert [r["student_id"] for r in db.list_students()] == ["S1"]
+    assert db.list_course_students("C1") == ["S1"]
+    assert db.get_course("C2")["instructor_id"] is None
+
+
+def test_iter_export_rows(db):
+    _populate(db)
+    db.register_student("S1", "C2")
+    assert list(db.iter_export_rows("students")) == [("S1", "Sam", 20, "s@x.com", "C1 C2")]
+    assert list(db.iter_export_rows("courses")) == [
+        ("C1", "Math", "I1", "Alice", "S1"), ("C2", "Art", None, None, "S1")]
+    assert all(len(DB.EXPORT_HEADERS[k]) == 5 for k in DB.EXPORT_HEADERS)
+
+
+def test_rename_student_cascades_to_registrations(db):
+    _populate(db)
+    db.rename_student("S1", "S9", "Sam", 20, "s@x.com")
+    assert db.get_student("S1") is None
+    assert db.list_student_courses("S9") == ["C1"]
+    assert db.list_course_students("C1") == ["S9"]
+
+
+def test_rename_course_cascades_to_registrations(db):
+    _populate(db)
+    db.rename_course("C1", "C9", "Math", "I1")
+    assert db.list_student_courses("S1") == ["C9"]
+    assert db.list_course_students("C9") == ["S1"]
+
+
+def test_rename_instructor_cascades_to_courses(db):
+    _populate(db)
+    db.rename_instructor("I1", "I9", "Alice", 40, "a@x.com")
+    assert db.get_course("C1")["instructor_id"] == "I9"
+    courses = {r["course_id"]: r for r in db.list_courses()}
+    assert (courses["C1"]["instructor_id"], courses["C1"]["instructor_name"]) == ("I9", "Alice")
+
+
+def test_list_cache_reused_until_its_tables_change(db):
+    _populate(db)
+    students = db.list_students()
+    courses = db.list_courses()
+    assert db.list_students() is students
+    assert db.list_courses() is courses
+
+    # An instructor edit invalidates courses (names are joined in) but not students
+    db.update_instructor("I1", "Alicia", 40, "a@x.com")
+    assert db.list_students() is students
+    assert [r["instructor_name"] for r in db.list_courses()] == ["Alicia", None]
+
+    db.delete_instructor("I1")
+    assert [r["instructor_id"] for r in db.list_courses()] == [None, None]
+
+
+def test_list_cache_sees_commits_from_other_connections(db):
+    _populate(db)
+    assert [r["student_id"] for r in db.list_students()] == ["S1"]
+    # The counters can't see this write; PRAGMA data_version does
+    other = DB(db.path)
+    other.create_student("S2", "Bob", 21, "b@x.com")
+    other.close()
+    assert [r["student_id"] for r in db.list_students()] == ["S1", "S2"]
@@ -0,0 +1,111 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+# No display is needed for the window-level tests
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# PyQt5.py shares its name with the PyQt5 package, so it is loaded from its path
+_spec = importlib.util.spec_from_file_location(
+    "school_qt", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "PyQt5.py"))
+app = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(app)
+
+
+def test_save_json_sees_model_level_edits(tmp_path):
+    dm = app.DataManager()
+    ins = app.Instructor("Alice", 40, "a@x.com", "I1")
+    other = app.Instructor("Bob", 50, "b@x.com", "I2")
+    stu = app.Student("Sam", 20, "s@x.com", "S1")
+    dm.add_instructor(ins); dm.add_instructor(other); dm.add_student(stu)
+    course = app.Course("C1", "Math", ins)
+    dm.add_course(course)
+    dm.save_json(str(tmp_path / "first.json"))
+
+    # Edits through the model API only, no mark_dirty()
+    course.add_student(stu)
+    course.set_instructor(other)
+    stu.name = "Samuel"
+    path = tmp_path / "second.json"
+    dm.save_json(str(path))
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["students"][0]["name"] == "Samuel"
+    assert data["students"][0]["registered_course_ids"] == ["C1"]
+    assert data["courses"][0]["instructor_id"] == "I2"
+    assert data["courses"][0]["enrolled_student_ids"] == ["S1"]
+
+
+def test_people_accept_email_keyword():
+    stu = app.Student(name="Sam", age=20, email="s@x.com", student_id="S1")
+    ins = app.Instructor(name="Alice", age=40, email="a@x.com", instructor_id="I1")
+    assert stu.to_dict()["email"] == "s@x.com"
+    assert ins.to_dict()["email"] == "a@x.com"
+    with pytest.raises(ValueError):
+        app.Student(name="Sam", age=20, email="not-an-email", student_id="S2")
+
+
+def test_email_index_follows_add_and_reload(tmp_path):
+    dm = app.DataManager()
+    dm.add_student(app.Student("Sam", 20, "s@x.com", "S1"))
+    dm.add_instructor(app.Instructor("Alice", 40, "a@x.com", "I1"))
+    assert dm.email_in_use("s@x.com") and dm.email_in_use("a@x.com")
+    assert not dm.email_in_use("s@x.com", exclude_kind="student", exclude_id="S1")
+    with pytest.raises(ValueError):
+        dm.add_instructor(app.Instructor("Bob", 50, "s@x.com", "I2"))
+
+    path = str(tmp_path / "dm.json")
+    dm.save_json(path)
+    loaded = app.DataManager.load_json(path)
+    assert loaded.email_in_use("s@x.com") and loaded.email_in_use("a@x.com")
+
+
+@pytest.fixture
+def window(monkeypatch):
+    qapp = app.QApplication.instance() or app.QApplication([])
+    errors = []
+    monkeypatch.setattr(app.QMessageBox, "critical", lambda *a: errors.append(a[2]))
+    monkeypatch.setattr(app.QMessageBox, "information", lambda *a: None)
+    w = app.SchoolQt()
+    w.errors = errors
+    yield w
+    w.close()
+    qapp.processEvents()
+
+
+def _submit_student(w, name, age, email, sid):
+    w.s_name.setText(name)
+    w.s_age.setText(str(age))
+    w.s_email.setText(email)
+    w.s_id.setText(sid)
+    w._add_or_update_student()
+
+
+def test_email_index_follows_student_edit_rename_and_delete(window):
+    w = window
+    _submit_student(w, "Sam", 20, "s@x.com", "S1")
+    assert w.dm._email_owners == {"s@x.com": ("student", "S1")}
+
+    # Edit with a new id and email: the old address is freed, the new one points at the new id
+    w.edit_mode["students"] = "S1"
+    _submit_student(w, "Sam", 20, "sam@x.com", "S2")
+    assert w.errors == []
+    assert w.dm._email_owners == {"sam@x.com": ("student", "S2")}
+    assert not w.dm.email_in_use("s@x.com")
+
+    # The freed address can be reused; the taken one cannot
+    _submit_student(w, "Other", 30, "sam@x.com", "S3")
+    assert w.errors == ["Email already in use: sam@x.com"]
+    _submit_student(w, "Other", 30, "s@x.com", "S3")
+    assert w.dm._email_owners["s@x.com"] == ("student", "S3")
+
+    w.tabs.setCurrentWidget(w.stu_table)
+    w.stu_table.selectRow(0)
+    w._delete_selected()
+    assert "S2" not in w.dm.students
+    assert w.dm._email_owners == {"s@x.com": ("student", "S3")}
@@ -0,0 +1,37 @@
+import importlib.util
+import os
+import re
+import sys
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+import db_doc
+
+# The app imports the database layer as "db"; db_doc.py is that module
+sys.modules.setdefault("db", db_doc)
+_spec = importlib.util.spec_from_file_location(
+    "school_tk", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Tkinter_Integration.py"))
+app = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(app)
+
+# The pattern validate_email replaced; both must accept exactly the same strings
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}")
+
+EMAILS = [
+    "a@b.co", "first.last+tag@mail.example.org", "x_y%z-w@a-b.c-d.museum", "A1@B2.CD",
+    "", "@b.co", "a@", "a@b", "a@b.c", "a@.co", "a@b.c0", "a@@b.co", "a b@c.co",
+    "a@b.co ", "a@b.co\n", "é@b.co", "a@b.cö", "a@b.co.", "a@b..co", "a.b@c_d.co", "a@b.c-o",
+]
+
+
+@pytest.mark.parametrize("email", EMAILS)
+def test_validate_email_matches_the_regex(email):
+    expected = EMAIL_PATTERN.fullmatch(email) is not None
+    try:
+        app.validate_email(email)
+        accepted = True
+    except ValueError:
+        accepted = False
+    assert accepted == expected